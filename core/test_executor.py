@@ -411,6 +411,23 @@ async def run_type_check(source_file: str, max_iterations: int = 5, **kwargs) ->
     return await executor.execute_test('type_check', source_file, max_iterations, **kwargs)
 
 
+async def run_type_check_batch(source_files: List[str], **kwargs) -> Dict[str, TestResult]:
+    """Run a single type check pass over several source files.
+    
+    All files are checked with one mypy invocation, which is much faster
+    than checking them one by one.
+    
+    Args:
+        source_files: Paths to the source files
+        **kwargs: Additional type check parameters
+        
+    Returns:
+        Dict[str, TestResult]: Test result per source file
+    """
+    test_instance = TypeCheckTest()
+    return await test_instance.run_batch(source_files, attempt_id=str(uuid.uuid4()), **kwargs)
+
+
 async def run_security_check(source_file: str, max_iterations: int = 5, **kwargs) -> TestExecutionResult:
     """Run security check on a source file.
     
@@ -0,0 +1,196 @@
+"""Tests for the Semgrep scanner integration.
+
+These tests exercise command building and result processing without
+requiring the semgrep binary to be installed.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from testsuite.static_tests.semgrep_scanner import SemgrepScanner
+
+
+def _semgrep_result(path, severity, line=1, check_id="rule"):
+    """Build a minimal semgrep JSON result."""
+    return {
+        "check_id": check_id,
+        "path": path,
+        "start": {"line": line, "col": 1},
+        "end": {"line": line, "col": 10},
+        "extra": {
+            "severity": severity,
+            "message": f"{check_id} finding",
+            "metadata": {"category": "security", "cwe": ["CWE-89"]}
+        }
+    }
+
+
+class TestSemgrepScanner:
+    """Test cases for SemgrepScanner."""
+    
+    @pytest.fixture
+    def scanner(self):
+        """Create a SemgrepScanner instance."""
+        return SemgrepScanner(severity_threshold="medium")
+    
+    def test_build_command_with_multiple_targets(self, scanner):
+        """Test that all target paths are passed to one semgrep command."""
+        command = scanner._build_semgrep_command(target_paths=["a.py", "b.py"])
+        
+        assert command[0] == "semgrep"
+        assert "--json" in command
+        assert command[-2:] == ["a.py", "b.py"]
+    
+    def test_scan_paths_missing_target(self, scanner):
+        """Test scanning a path that does not exist."""
+        result = scanner.scan_paths(["/nonexistent/path.py"])
+        
+        assert result["success"] is False
+        assert "does not exist" in result["error"]
+    
+    def test_process_results_filters_and_summarizes(self, scanner):
+        """Test severity filtering, conversion and summary in one pass."""
+        results = [
+            _semgrep_result("a.py", "ERROR", line=3, check_id="sql"),
+            _semgrep_result("a.py", "INFO", line=4, check_id="style"),
+            _semgrep_result("b.py", "WARNING", line=1, check_id="weak"),
+        ]
+        
+        processed = scanner._process_results(results, "src")
+        
+        assert processed["success"] is True
+        assert [issue["rule_id"] for issue in processed["issues"]] == ["sql", "weak"]
+        assert processed["issues"][0]["severity"] == "high"
+        assert processed["issues"][0]["metadata"]["cwe"] == ["CWE-89"]
+        
+        summary = processed["summary"]
+        assert summary["total_issues"] == 2
+        assert summary["files_with_issues"] == 2
+        assert summary["by_severity"] == {"high": 1, "medium": 1}
+        assert summary["target_path"] == "src"
+    
+    def test_parse_invalid_output(self, scanner):
+        """Test handling of malformed semgrep output."""
+        result = scanner._parse_semgrep_output("not json", "src")
+        
+        assert result["success"] is False
+        assert "Failed to parse" in result["error"]
+    
+    def test_merge_results_combines_chunks(self, scanner):
+        """Test merging of per-chunk results from a parallel scan."""
+        first = scanner._process_results([_semgrep_result("a.py", "ERROR")], "a.py")
+        second = scanner._process_results(
+            [_semgrep_result("a.py", "WARNING"), _semgrep_result("b.py", "ERROR")], "b.py"
+        )
+        failed = {"success": False, "error": "boom", "issues": [], "summary": {}}
+        
+        merged = scanner._merge_results([first, second, failed], "a.py, b.py")
+        
+        assert merged["success"] is False
+        assert merged["error"] == "boom"
+        assert len(merged["issues"]) == 3
+        assert merged["summary"]["by_severity"] == {"high": 2, "medium": 1}
+        assert merged["summary"]["by_file"] == {"a.py": 2, "b.py": 1}
+    
+    def test_parse_bytes_output(self, scanner):
+        """Test parsing semgrep output captured as raw bytes."""
+        output = b'{"results": [{"check_id": "sql", "path": "a.py", "extra": {"severity": "ERROR"}}]}'
+        
+        result = scanner._parse_semgrep_output(output, "a.py")
+        
+        assert result["success"] is True
+        assert result["issues"][0]["rule_id"] == "sql"
+        assert "raw_output" not in result
+        assert result["errors"] == []
+    
+    def test_streamed_output_matches_buffered(self, scanner):
+        """Test that streaming parses the same report fields as buffering."""
+        pytest.importorskip("ijson")
+        import io
+        import json
+        
+        output = json.dumps({
+            "version": "1.50.0",
+            "results": [_semgrep_result("a.py", "ERROR"), _semgrep_result("b.py", "INFO")],
+            "errors": [{"type": "Timeout", "message": "b.py timed out"}]
+        }).encode("utf-8")
+        
+        with patch.object(SemgrepScanner, "_STREAM_CHUNK_SIZE", 16):
+            streamed = scanner._parse_semgrep_stream(io.BytesIO(output), "src")
+        buffered = scanner._parse_semgrep_output(output, "src")
+        
+        assert streamed.keys() == buffered.keys()
+        assert streamed["issues"] == buffered["issues"]
+        assert streamed["errors"] == [{"type": "Timeout", "message": "b.py timed out"}]
+        assert streamed["version"] == "1.50.0"
+        
+        empty = scanner._parse_semgrep_stream(io.BytesIO(b'{"results": []}'), "src")
+        assert empty["errors"] == [] and empty["version"] is None
+    
+    def test_streamed_parse_error(self, scanner):
+        """Test that a parse error is reported rather than the killed exit code."""
+        pytest.importorskip("ijson")
+        import os
+        import sys
+        
+        cmd = [
+            sys.executable, "-c",
+            "import sys, time; sys.stdout.write('x' * 200000); sys.stdout.flush(); time.sleep(5)"
+        ]
+        result = scanner._run_semgrep_streaming(cmd, "src", dict(os.environ))
+        
+        assert result["success"] is False
+        assert "Failed to parse semgrep JSON output" in result["error"]
+        
+        # A semgrep that failed on its own still reports its exit code
+        cmd = [sys.executable, "-c", "import sys; sys.stderr.write('bad config'); sys.exit(2)"]
+        result = scanner._run_semgrep_streaming(cmd, "src", dict(os.environ))
+        
+        assert result["error"] == "Semgrep failed with return code 2: bad config"
+    
+    def test_scan_skipped_without_candidate_files(self, scanner, tmp_path):
+        """Test that semgrep is not run when no file matches the rule languages."""
+        pytest.importorskip("yaml")
+        rules_dir = tmp_path / "rules"
+        rules_dir.mkdir()
+        (rules_dir / "python.yml").write_text(
+            "rules:\n"
+            "  - id: py-only\n"
+            "    languages: [python]\n"
+            "    severity: ERROR\n"
+            "    message: test\n"
+            "    pattern: eval(...)\n"
+        )
+        target = tmp_path / "web"
+        target.mkdir()
+        (target / "app.js").write_text("eval(x)\n")
+        
+        with patch("subprocess.run") as mock_run, patch("subprocess.Popen") as mock_popen:
+            result = scanner.scan_directory(str(target), custom_rules=str(rules_dir))
+        
+        assert result["success"] is True
+        assert result["issues"] == []
+        assert result["summary"]["total_issues"] == 0
+        mock_run.assert_not_called()
+        mock_popen.assert_not_called()
+        
+        (target / "app.py").write_text("eval(x)\n")
+        assert scanner._has_candidate_files([str(target)], scanner._target_extensions([str(rules_dir / "python.yml")]))
+    
+    def test_excluded_targets_are_not_scanned(self, tmp_path):
+        """Test client-side exclusion of targets and the matcher cache."""
+        target = tmp_path / "generated.py"
+        target.write_text("x = 1\n")
+        scanner = SemgrepScanner(default_exclude_patterns=["generated.py", "*.pyc", "*.pyc"])
+        
+        assert scanner.default_exclude_patterns == ["*.pyc", "generated.py"]
+        
+        with patch("subprocess.run") as mock_run, patch("subprocess.Popen") as mock_popen:
+            first = scanner.scan_file(str(target))
+            second = scanner.scan_file(str(target))
+        
+        assert first["success"] is True and first["issues"] == []
+        assert second["summary"]["total_issues"] == 0
+        mock_run.assert_not_called()
+        mock_popen.assert_not_called()
+        assert scanner.cache_stats() == {"hits": 1, "misses": 1, "size": 1}
@@ -19,6 +19,15 @@ from core.test_executor import TestExecutor, run_syntax_check, run_all_static_te
 from models.test_result import TestSeverity, TestStatus, TestCategory
 
 
+@pytest.fixture(autouse=True)
+def type_cache_dir(tmp_path, monkeypatch):
+    """Keep type check cache entries in a temporary directory."""
+    from testsuite.static_tests import _type_cache
+    
+    monkeypatch.setattr(_type_cache, 'CACHE_DIR', str(tmp_path / "type_cache"))
+    monkeypatch.setattr(_type_cache, '_cache', None)
+
+
 class TestSyntaxCheckTest:
     """Test cases for SyntaxCheckTest."""
     
@@ -107,6 +116,21 @@ def broken_function(
         assert result.issues[0].severity == TestSeverity.CRITICAL
         assert "File not found" in result.issues[0].message
     
+    def test_todo_markers(self, syntax_test):
+        """Test that only exact '# todo:' and '# fixme' comments are reported."""
+        source = (
+            b"x = 1  # TODO: rename x\n"
+            b"y = 2  #todo: not a marker\n"
+            b"z = 3  #\ttodo: not a marker\n"
+            b"# FixMe later\n"
+        )
+        
+        issues = syntax_test._check_for_todo_issues(source, "a.py")
+        
+        assert [(issue.line, issue.rule_id) for issue in issues] == [(1, "TODO_FOUND"), (4, "FIXME_FOUND")]
+        assert issues[0].message == "TODO item found: rename x"
+        assert issues[0].column == 7
+    
     def test_interface_compliance(self, syntax_test):
         """Test that SyntaxCheckTest implements ITestCase interface."""
         assert isinstance(syntax_test, ITestCase)
@@ -172,6 +196,310 @@ def main() -> None:
             assert result.tool == "mypy"
             assert "mypy not available" in result.output.lower()
     
+    def test_result_cache_roundtrip(self, typed_python_file, tmp_path):
+        """Test storing and loading cached type check results."""
+        from testsuite.static_tests import _type_cache
+        from models.test_result import TestIssue
+        
+        issue = TestIssue(
+            file=typed_python_file,
+            line=3,
+            message="Incompatible return value type",
+            severity=TestSeverity.HIGH,
+            rule_id="return-value"
+        )
+        
+        with patch.object(_type_cache, 'CACHE_DIR', str(tmp_path)), \
+             patch.object(_type_cache, 'diskcache', None):
+            key = _type_cache.make_key(typed_python_file, "mypy 1.0", False, True)
+            assert _type_cache.get(key) is None
+            
+            _type_cache.put(key, [issue], ["mypy output:"])
+            cached = _type_cache.get(key)
+            
+            assert cached['issues'] == [issue]
+            assert cached['output'] == ["mypy output:"]
+            assert _type_cache.make_key(typed_python_file, "mypy 1.0", True, True) != key
+    
+    def test_cache_key_scope(self, tmp_path, monkeypatch):
+        """Test that cache keys cover the file path and the mypy config."""
+        from testsuite.static_tests import _type_cache
+        
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text("x: int = 1\n")
+        (tmp_path / "b.py").write_text("x: int = 1\n")
+        
+        key = _type_cache.make_key("a.py", "mypy 1.0", False, True)
+        assert _type_cache.make_key("b.py", "mypy 1.0", False, True) != key
+        assert _type_cache.make_key(str(tmp_path / "a.py"), "mypy 1.0", False, True) == key
+        
+        (tmp_path / "mypy.ini").write_text("[mypy]\nstrict = True\n")
+        assert _type_cache.make_key("a.py", "mypy 1.0", False, True) != key
+    
+    def test_parse_mypy_output(self, type_test):
+        """Test parsing mypy output with and without column numbers."""
+        issues = type_test._parse_mypy_output([
+            'a.py:3: error: Incompatible return value type (got "str", expected "int")  [return-value]',
+            'a.py:5:9: note: Revealed type is "List[int]"',
+            'Found 1 error in 1 file (checked 1 source file)',
+        ])
+        
+        assert len(issues) == 2
+        assert issues[0].line == 3
+        assert issues[0].column == 0
+        assert issues[0].severity == TestSeverity.HIGH
+        assert issues[0].rule_id == "return-value"
+        assert issues[0].message.endswith('expected "int")')
+        assert issues[1].column == 9
+        assert issues[1].severity == TestSeverity.LOW
+        assert issues[1].rule_id == "TYPE_ERROR"
+        assert issues[1].message == 'Revealed type is "List[int]"'
+        
+        diagnostics = []
+        json_issues = type_test._parse_mypy_output([
+            'Daemon started',
+            '{"file": "a.py", "line": 3, "column": 11, "message": "Incompatible return value type", '
+            '"hint": null, "code": "return-value", "severity": "error"}',
+            '{"file": "a.py", "line": 5, "column": -1, "message": "Library stubs not installed", '
+            '"hint": "Hint: \\"python3 -m pip install types-requests\\"", "code": "import-untyped", '
+            '"severity": "error"}',
+        ], json_output=True, diagnostics=diagnostics)
+        
+        assert len(json_issues) == 2
+        assert json_issues[0].column == 12
+        assert json_issues[0].severity == TestSeverity.HIGH
+        assert json_issues[0].rule_id == "return-value"
+        assert diagnostics == [
+            'a.py:3:12: error: Incompatible return value type  [return-value]',
+            'a.py:5: error: Library stubs not installed  [import-untyped]\n'
+            'a.py:5: note: Hint: "python3 -m pip install types-requests"',
+        ]
+        
+        batch_issues = type_test._parse_mypy_output([
+            'a.py:3: error: Incompatible return value type  [return-value]',
+            'lib/other.py:7: error: Name "x" is not defined  [name-defined]',
+            'b.py:1: error: Name "y" is not defined  [name-defined]',
+        ], source_files=[os.path.abspath('a.py'), 'b.py'])
+        
+        assert [issue.file for issue in batch_issues] == ['a.py', 'b.py']
+    
+    @pytest.mark.asyncio
+    async def test_notes_on_clean_exit(self, type_test):
+        """Test that notes are kept when mypy exits with 0."""
+        import subprocess
+        
+        completed = subprocess.CompletedProcess(
+            ['mypy'], 0, b'a.py:2:13: note: Revealed type is "builtins.int"\n', b'mypy.ini: warning\n'
+        )
+        with patch.object(type_test, '_is_dmypy_available', return_value=True), \
+             patch.object(type_test, '_mypy_json_output', False), \
+             patch.object(type_test, '_run_dmypy', AsyncMock(return_value=completed)):
+            result = await type_test._run_mypy(['a.py'], False, True)
+        
+        assert [issue.severity for issue in result['issues']] == [TestSeverity.LOW]
+        assert "mypy.ini: warning" in result['output']
+        assert result['output'][-1] == "[OK] Type check passed"
+    
+    @pytest.mark.asyncio
+    async def test_text_output_columns(self, type_test):
+        """Test that text mode requests columns to match JSON output."""
+        import subprocess
+        
+        completed = subprocess.CompletedProcess(
+            ['mypy'], 1, b'a.py:4:12: error: Incompatible return value type  [return-value]\n', b''
+        )
+        run_dmypy = AsyncMock(return_value=completed)
+        with patch.object(type_test, '_is_dmypy_available', return_value=True), \
+             patch.object(type_test, '_mypy_json_output', False), \
+             patch.object(type_test, '_run_dmypy', run_dmypy):
+            result = await type_test._run_mypy(['a.py'], False, True)
+        
+        assert '--show-column-numbers' in run_dmypy.call_args[0][0]
+        assert '--local-partial-types' in run_dmypy.call_args[0][0]
+        assert run_dmypy.call_args[0][1] == [os.path.abspath('a.py')]
+        assert result['issues'][0].column == 12
+    
+    @pytest.mark.asyncio
+    async def test_batch_output_per_file(self, tmp_path):
+        """Test that each file of a batch reports only its own diagnostics."""
+        import subprocess
+        
+        a_file = tmp_path / "a.py"
+        b_file = tmp_path / "b.py"
+        a_file.write_text("def f() -> int:\n    return 'x'\n")
+        b_file.write_text("x: int = 1\n")
+        
+        stdout = "".join(
+            f"{a_file}:{line}:12: error: Incompatible return value type  [return-value]\n"
+            for line in (2, 3, 4)
+        )
+        completed = subprocess.CompletedProcess(['mypy'], 1, stdout.encode('utf-8'), b'')
+        type_test = TypeCheckTest()
+        with patch.object(type_test, '_is_mypy_available', return_value=True), \
+             patch.object(type_test, '_is_dmypy_available', return_value=True), \
+             patch.object(type_test, '_mypy_json_output', False), \
+             patch.object(type_test, '_run_dmypy', AsyncMock(return_value=completed)):
+            results = await type_test.run_batch([str(a_file), str(b_file)], "test_attempt_5", use_cache=False)
+        
+        a_result = results[str(a_file)]
+        b_result = results[str(b_file)]
+        assert len(a_result.issues) == 3
+        assert a_result.output.endswith("[ERROR] Type check failed with 3 issues")
+        assert b_result.issues == []
+        assert str(a_file) not in b_result.output
+        assert b_result.output.endswith("[OK] Type check passed")
+    
+    @pytest.mark.asyncio
+    async def test_dmypy_follows_cwd(self, type_test, tmp_path, monkeypatch):
+        """Test that the mypy daemon is restarted when the working directory changes."""
+        if not type_test._is_dmypy_available():
+            pytest.skip("dmypy not available")
+        
+        for name in ("plain", "configured"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "m.py").write_text("def f(x):\n    return x\n")
+        (tmp_path / "configured" / "mypy.ini").write_text("[mypy]\ndisallow_untyped_defs = True\n")
+        
+        flags = ['--no-error-summary', '--local-partial-types']
+        monkeypatch.chdir(tmp_path / "plain")
+        plain = await type_test._run_dmypy(flags, ['m.py'])
+        monkeypatch.chdir(tmp_path / "configured")
+        configured = await type_test._run_dmypy(flags, ['m.py'])
+        
+        assert plain.returncode == 0
+        assert configured.returncode == 1
+        assert b'm.py:1: error' in configured.stdout
+    
+    @pytest.mark.asyncio
+    async def test_skipped_files(self, typed_python_file, tmp_path):
+        """Test that skip patterns and the skip marker bypass type checking."""
+        generated = tmp_path / "model_pb2.py"
+        generated.write_text("def f(x):\n    return x\n")
+        marked = tmp_path / "marked.py"
+        marked.write_text("# fixchain: type-skip\ndef f(x):\n    return x\n")
+        
+        type_test = TypeCheckTest(skip_patterns=["*_pb2.py"])
+        with patch.object(type_test, '_run_mypy') as run_mypy:
+            results = await type_test.run_batch([str(generated), str(marked)], "test_attempt_3")
+        
+        run_mypy.assert_not_called()
+        for result in results.values():
+            assert result.status == "pass"
+            assert result.summary == "skipped"
+        assert not type_test._is_skipped(typed_python_file)
+        
+        # The marker lookup is memoized until the file changes
+        with patch('builtins.open', side_effect=AssertionError("file re-read")):
+            assert type_test._is_skipped(str(marked))
+    
+    def test_skip_marker_memo_bounded(self, tmp_path):
+        """Test that the skip marker memo keeps only recently checked files."""
+        from testsuite.static_tests import type_check
+        
+        type_test = TypeCheckTest()
+        paths = []
+        for index in range(type_check._SKIP_MARKERS_MAX_ENTRIES + 1):
+            path = tmp_path / f"m{index}.py"
+            path.write_text("x = 1\n")
+            paths.append(str(path))
+            assert not type_test._is_skipped(str(path))
+        
+        assert len(type_check._skip_markers) <= type_check._SKIP_MARKERS_MAX_ENTRIES
+        assert paths[0] not in type_check._skip_markers
+        assert paths[-1] in type_check._skip_markers
+    
+    @pytest.mark.asyncio
+    async def test_batch_checked_in_parallel_shards(self, tmp_path, monkeypatch):
+        """Test that a larger batch is split across concurrent worker runs."""
+        import subprocess
+        from testsuite.static_tests import type_check
+        
+        files = []
+        for index in range(6):
+            path = tmp_path / f"m{index}.py"
+            path.write_text(f"def f{index}() -> int:\n    return 'x'\n")
+            files.append(str(path))
+        
+        class FakePool(type_check._MypyWorkerPool):
+            """Worker pool that records how many checks run at once."""
+            running = 0
+            peak = 0
+            
+            async def run(self, args, timeout):
+                FakePool.running += 1
+                FakePool.peak = max(FakePool.peak, FakePool.running)
+                await asyncio.sleep(0.05)
+                FakePool.running -= 1
+                out = "".join(
+                    f"{path}:2:12: error: Incompatible return value type  [return-value]\n"
+                    for path in args if path in files
+                )
+                return subprocess.CompletedProcess(['mypy'] + args, 1, out.encode('utf-8'), b'')
+        
+        monkeypatch.setattr(type_check, '_MAX_PARALLEL_CHECKS', 3)
+        type_test = TypeCheckTest()
+        with patch.object(type_test, '_is_mypy_available', return_value=True), \
+             patch.object(type_test, '_can_use_mypy_workers', return_value=True), \
+             patch.object(type_test, '_mypy_json_output', False), \
+             patch.object(type_test, '_run_dmypy', AsyncMock()) as run_dmypy, \
+             patch.object(type_check, '_worker_pool', FakePool(3)):
+            results = await type_test.run_batch(files, "test_attempt_4", use_cache=False)
+        
+        assert type_test._shard_files(files) == [files[0::3], files[1::3], files[2::3]]
+        assert FakePool.peak == 3
+        run_dmypy.assert_not_called()
+        for source_file, result in results.items():
+            assert [issue.file for issue in result.issues] == [source_file]
+    
+    def test_mypy_worker_pool(self, typed_python_file):
+        """Test that a mypy worker stays warm across event loops."""
+        pytest.importorskip("mypy.api")
+        from testsuite.static_tests.type_check import _MypyWorkerPool
+        
+        pool = _MypyWorkerPool(1)
+        try:
+            args = ['--no-error-summary', '--ignore-missing-imports', typed_python_file]
+            first = asyncio.run(pool.run(args, timeout=60))
+            worker = pool._workers[0]
+            second = asyncio.run(pool.run(args, timeout=60))
+            
+            assert first.returncode == second.returncode == 0
+            assert pool._workers == [worker]
+        finally:
+            pool.shutdown()
+    
+    def test_mypy_worker_follows_cwd(self, tmp_path, monkeypatch):
+        """Test that a warm worker resolves paths and config in the caller's cwd."""
+        pytest.importorskip("mypy.api")
+        from testsuite.static_tests.type_check import _MypyWorkerPool
+        
+        for name in ("plain", "configured"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "m.py").write_text("def f(x):\n    return x\n")
+        (tmp_path / "configured" / "mypy.ini").write_text("[mypy]\ndisallow_untyped_defs = True\n")
+        
+        pool = _MypyWorkerPool(1)
+        try:
+            monkeypatch.chdir(tmp_path / "plain")
+            plain = asyncio.run(pool.run(['--no-error-summary', 'm.py'], timeout=60))
+            monkeypatch.chdir(tmp_path / "configured")
+            configured = asyncio.run(pool.run(['--no-error-summary', 'm.py'], timeout=60))
+            
+            assert plain.returncode == 0
+            assert configured.returncode == 1
+            assert b'm.py:1: error' in configured.stdout
+            assert len(pool._workers) == 1
+        finally:
+            pool.shutdown()
+    
+    @pytest.mark.parametrize("value, expected", [("3", 3), ("0", 1), ("-2", 1), ("many", None)])
+    def test_parallel_checks_setting(self, monkeypatch, value, expected):
+        """Test that FIXCHAIN_TYPE_PARALLEL is parsed defensively."""
+        from testsuite.static_tests.type_check import _read_parallel_checks
+        
+        monkeypatch.setenv("FIXCHAIN_TYPE_PARALLEL", value)
+        assert _read_parallel_checks() == (expected or os.cpu_count() or 1)
+    
     def test_interface_compliance(self, type_test):
         """Test that TypeCheckTest implements ITestCase interface."""
         assert isinstance(type_test, ITestCase)
@@ -272,6 +600,61 @@ def safe_command(args: List[str]) -> str:
         assert result.tool == "bandit"
         # Should have fewer or no issues
     
+    @pytest.mark.asyncio
+    async def test_stream_insecure_file(self, security_test, insecure_python_file):
+        """Test streaming security issues from an insecure Python file."""
+        output_lines = []
+        issues = [
+            issue async for issue in security_test.stream(
+                insecure_python_file, output_lines=output_lines
+            )
+        ]
+        
+        rule_ids = {issue.rule_id for issue in issues}
+        assert "HARDCODED_PASSWORD" in rule_ids
+        assert "EVAL_USAGE" in rule_ids
+        assert any(line.startswith("Custom security patterns:") for line in output_lines)
+    
+    @pytest.mark.asyncio
+    async def test_custom_patterns_line_endings(self, security_test, tmp_path):
+        """Test that custom pattern lines follow universal newlines."""
+        source = "x = 1\nprint(x)\nresult = eval(data)\n"
+        
+        for name, newline in (("lf", "\n"), ("crlf", "\r\n"), ("cr", "\r")):
+            path = tmp_path / f"{name}.py"
+            path.write_bytes(source.replace("\n", newline).encode("utf-8"))
+            issues = [issue async for issue in security_test._run_custom_security_check(str(path))]
+            
+            assert [(issue.rule_id, issue.line) for issue in issues] == [("EVAL_USAGE", 3)]
+    
+    @pytest.mark.asyncio
+    async def test_bandit_worker_failure(self, security_test, insecure_python_file, tmp_path):
+        """Test that worker failures fall back to the CLI and bandit errors are reported."""
+        import re
+        from testsuite.static_tests import security_check
+        
+        if not security_test._is_bandit_available():
+            pytest.skip("bandit not available")
+        
+        worker = Mock()
+        worker.scan.side_effect = security_check._BanditScanError("boom")
+        output_lines = []
+        with patch.object(security_check, '_get_bandit_worker', return_value=worker):
+            issues = [
+                issue async for issue in security_test.stream(
+                    insecure_python_file, output_lines=output_lines
+                )
+            ]
+        
+        assert "Bandit worker failed, using the bandit CLI: boom" in output_lines
+        assert any(re.fullmatch(r"B\d+", issue.rule_id) for issue in issues)
+        
+        broken = tmp_path / "broken.py"
+        broken.write_text("def f(:\n    pass\n")
+        result = await security_test.run(str(broken), "test_attempt_3")
+        
+        assert f"Bandit error: {broken}: syntax error while parsing AST from file" in result.output
+    
     def test_interface_compliance(self, security_test):
         """Test that SecurityCheckTest implements ITestCase interface."""
         assert isinstance(security_test, ITestCase)
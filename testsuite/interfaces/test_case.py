@@ -4,44 +4,44 @@ This module defines the ITestCase interface that all test implementations must f
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional
 from models.test_result import TestIssue
 
 
+# Shared read-only metadata for results created without any
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
 class TestResult:
     """Test execution result structure."""
     
-    def __init__(
-        self,
-        test_name: str,
-        test_type: str,
-        issues: List[TestIssue],
-        summary: str,
-        status: str,
-        tool: str,
-        output: str,
-        metadata: Optional[Dict[str, Any]] = None
-    ):
-        self.test_name = test_name
-        self.test_type = test_type
-        self.issues = issues
-        self.summary = summary
-        self.status = status  # 'pass' or 'fail'
-        self.tool = tool
-        self.output = output
-        self.metadata = metadata or {}
+    test_name: str
+    test_type: str
+    issues: List[TestIssue]
+    summary: str
+    status: str  # 'pass' or 'fail'
+    tool: str
+    output: str
+    metadata: Optional[Mapping[str, Any]] = None
+    
+    def __post_init__(self) -> None:
+        if self.metadata is None:
+            self.metadata = _EMPTY_METADATA
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format."""
         return {
             'test_name': self.test_name,
             'test_type': self.test_type,
-            'issues': [issue.dict() for issue in self.issues],
+            'issues': [issue.model_dump() for issue in self.issues],
             'summary': self.summary,
             'status': self.status,
             'tool': self.tool,
             'output': self.output,
-            'metadata': self.metadata
+            'metadata': {} if self.metadata is _EMPTY_METADATA else self.metadata
         }
 
 
@@ -0,0 +1,176 @@
+"""Persistent cache of type check results.
+
+Results are keyed by a SHA-256 digest of the checked source together with
+its absolute path, the type checker version and options, and the state of
+the mypy config files, so an unchanged file is never checked twice.
+Entries are stored with diskcache when it is installed, otherwise as one
+JSON file per key, under FIXCHAIN_CACHE_DIR (default: the user cache
+directory).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.test_result import TestIssue
+
+try:
+    import orjson as _json
+except ImportError:
+    _json = json  # type: ignore[misc]
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+def _cache_root() -> str:
+    """Get the absolute cache root, FIXCHAIN_CACHE_DIR or the user cache directory."""
+    root = os.environ.get('FIXCHAIN_CACHE_DIR')
+    if not root:
+        user_cache = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        root = os.path.join(user_cache, 'fixchain')
+    return os.path.abspath(root)
+
+
+CACHE_DIR = os.path.join(_cache_root(), 'type')
+
+# Config files mypy reads from the working directory, in lookup order
+_MYPY_CONFIG_FILES = ('mypy.ini', '.mypy.ini', 'pyproject.toml', 'setup.cfg')
+
+_cache = None
+
+# Source digests keyed by path, as (mtime_ns, size, digest); a matching stat
+# lets an unchanged file skip re-hashing
+_digests: Dict[str, Tuple[int, int, str]] = {}
+
+
+def source_digest(source_file: str) -> str:
+    """Get the SHA-256 digest of a source file.
+    
+    Args:
+        source_file: Path to the source file
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    st = os.stat(source_file)
+    cached = _digests.get(source_file)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    
+    with open(source_file, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _digests[source_file] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def config_stamps() -> List[Tuple[str, int, int]]:
+    """Get (path, mtime_ns, size) of each mypy config file that exists.
+    
+    Returns:
+        List[Tuple[str, int, int]]: Stamps of the config files mypy would
+        read from the current working directory, in lookup order
+    """
+    stamps = []
+    for name in _MYPY_CONFIG_FILES:
+        path = os.path.abspath(name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps.append((path, st.st_mtime_ns, st.st_size))
+    return stamps
+
+
+def make_key(source_file: str, *parts: Any) -> str:
+    """Build the cache key for checking a file with the given settings.
+    
+    Besides the source digest, the key covers the file's absolute path, as
+    issues name the file they were found in, and the mtime and size of the
+    mypy config files, so that editing the config invalidates old results.
+    
+    Args:
+        source_file: Path to the source file
+        *parts: Checker version and options that affect the result
+        
+    Returns:
+        str: Cache key
+    """
+    settings = repr((os.path.abspath(source_file), config_stamps(), parts))
+    settings_hash = hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]
+    return f"{source_digest(source_file)}-{settings_hash}"
+
+
+def _get_cache():
+    """Return the diskcache instance, or None when using JSON files."""
+    global _cache
+    if _cache is None and diskcache is not None:
+        _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Look up cached type check results.
+    
+    Args:
+        key: Cache key from make_key
+        
+    Returns:
+        Dict with 'issues' (List[TestIssue]) and 'output' (List[str]),
+        or None on a cache miss
+    """
+    cache = _get_cache()
+    try:
+        if cache is not None:
+            entry = cache.get(key)
+        else:
+            with open(os.path.join(CACHE_DIR, f"{key}.json"), 'rb') as f:
+                entry = _json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    if entry is None:
+        return None
+    
+    return {
+        'issues': [TestIssue.model_validate(issue) for issue in entry['issues']],
+        'output': entry['output']
+    }
+
+
+def put(key: str, issues: List[TestIssue], output: List[str]) -> None:
+    """Store type check results.
+    
+    Args:
+        key: Cache key from make_key
+        issues: Issues found by the check
+        output: Output lines of the check
+    """
+    entry = {
+        'issues': [issue.model_dump(mode='json') for issue in issues],
+        'output': output
+    }
+    
+    cache = _get_cache()
+    try:
+        if cache is not None:
+            cache.set(key, entry)
+            return
+        
+        # Write to a temporary file first so readers never see partial entries
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        data = _json.dumps(entry)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(CACHE_DIR, f"{key}.json"))
+    except OSError:
+        # Caching is best effort
+        pass
@@ -0,0 +1,72 @@
+"""Persistent bandit worker process.
+
+This script keeps a single Python interpreter with bandit loaded and serves
+security scans over stdin/stdout, so repeated checks do not pay interpreter
+startup and bandit import costs for every file.
+
+Protocol (one JSON object per line):
+    request:  {"file": str, "severity": str, "confidence": str}
+    response: {"results": [...], "errors": [...]}, or {"error": str} when
+              the scan itself raised
+
+The ``results`` and ``errors`` entries use the same shape as
+``bandit -f json`` output.
+"""
+
+import json
+import logging
+import sys
+
+from bandit.core import config as bandit_config
+from bandit.core import constants
+from bandit.core import manager as bandit_manager
+
+
+def _rank(level: str) -> str:
+    """Map a user-facing level name onto a bandit ranking."""
+    level = (level or 'low').upper()
+    return level if level in constants.RANKING else 'LOW'
+
+
+def _scan(conf: bandit_config.BanditConfig, request: dict) -> dict:
+    """Run bandit on the requested file and return JSON-ready results."""
+    mgr = bandit_manager.BanditManager(conf, 'file', quiet=True)
+    mgr.discover_files([request['file']])
+    mgr.run_tests()
+    issues = mgr.get_issue_list(
+        sev_level=_rank(request.get('severity')),
+        conf_level=_rank(request.get('confidence'))
+    )
+    return {
+        'results': [issue.as_dict() for issue in issues],
+        'errors': [{'filename': fname, 'reason': reason} for fname, reason in mgr.skipped]
+    }
+
+
+def main() -> None:
+    """Serve scan requests until stdin is closed."""
+    logging.disable(logging.CRITICAL)
+    
+    # Keep stray prints from bandit out of the response channel
+    responses = sys.stdout
+    sys.stdout = sys.stderr
+    
+    conf = bandit_config.BanditConfig()
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            request = json.loads(line)
+            response = _scan(conf, request)
+        except Exception as e:
+            response = {'error': str(e)}
+        
+        responses.write(json.dumps(response) + '\n')
+        responses.flush()
+
+
+if __name__ == '__main__':
+    main()
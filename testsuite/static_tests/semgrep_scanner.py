@@ -4,27 +4,132 @@ This module provides integration with Semgrep for security vulnerability scannin
 across multiple programming languages and frameworks.
 """
 
+import fnmatch
+import gzip
 import json
 import subprocess
 import logging
+import re
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
+from typing import FrozenSet, Iterable, Iterator, List, Dict, Any, Optional, Pattern, Tuple, Union
 from datetime import datetime
-import requests
-import glob
 import os
 
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so bug imports reuse pooled keep-alive connections;
+# created on first use so importing the scanner does not load requests
+_SESSION = None
+
+
+def _get_session():
+    """Return the shared requests session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.headers["Content-Type"] = "application/json"
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _list_rule_files(rules_dir: str) -> List[str]:
+    """List the YAML rule files in a directory with a single scandir pass."""
+    with os.scandir(rules_dir) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.name.endswith((".yml", ".yaml")) and entry.is_file()
+        )
+
 
 class SemgrepScanner:
     """Semgrep security scanner integration."""
     
+    # Semgrep severities mapped onto our standard levels
+    _SEVERITY_MAPPING = {
+        "info": "low",
+        "warning": "medium",
+        "error": "high"
+    }
+    
+    # Rank of every known semgrep or standard severity
+    _SEVERITY_RANK = {
+        "info": 0,
+        "low": 0,
+        "warning": 1,
+        "medium": 1,
+        "error": 2,
+        "high": 2,
+        "critical": 3
+    }
+    
+    # Rule files per rules directory as (directory mtime_ns, files), shared
+    # by all scanner instances
+    _rule_files_cache: Dict[str, Tuple[int, List[str]]] = {}
+    
+    # Languages declared by each rule file as (file mtime_ns, languages)
+    _rule_languages_cache: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+    
+    # File extensions semgrep scans for each rule language. Rules for any
+    # other language (generic, regex, dockerfile, ...) disable pre-filtering.
+    _EXT_BY_LANG = {
+        "python": (".py", ".pyi"),
+        "javascript": (".js", ".jsx", ".mjs", ".cjs"),
+        "js": (".js", ".jsx", ".mjs", ".cjs"),
+        "typescript": (".ts", ".tsx"),
+        "ts": (".ts", ".tsx"),
+        "java": (".java",),
+        "go": (".go",),
+        "c": (".c", ".h"),
+        "cpp": (".cpp", ".cc", ".cxx", ".hpp", ".hh", ".h"),
+        "ruby": (".rb",),
+        "php": (".php",),
+        "json": (".json",),
+        "yaml": (".yml", ".yaml")
+    }
+    
+    # Environment passed to semgrep, captured from os.environ on first use
+    _semgrep_env: Optional[Dict[str, str]] = None
+    
+    # Bytes of semgrep output read per step when streaming
+    _STREAM_CHUNK_SIZE = 64 * 1024
+    
     def __init__(self, 
                  config: str = "auto",
                  severity_threshold: str = "medium",
                  max_target_bytes: Optional[int] = None,
-                 timeout: int = 300):
+                 timeout: int = 300,
+                 default_exclude_patterns: Optional[List[str]] = None,
+                 scan_session_time: Optional[str] = None):
         """
         Initialize Semgrep scanner.
         
@@ -33,12 +138,25 @@ class SemgrepScanner:
             severity_threshold: Minimum severity to report (low, medium, high, critical)
             max_target_bytes: Maximum file size to scan
             timeout: Timeout in seconds for semgrep execution
+            default_exclude_patterns: Exclude patterns applied to every scan
+            scan_session_time: ISO timestamp shared by every scan summary of
+                this scanner; each summary is stamped when built if not set
         """
         self.config = config
         self.severity_threshold = severity_threshold.lower()
         self.max_target_bytes = max_target_bytes
         self.timeout = timeout
         self.severity_levels = ["low", "medium", "high", "critical"]
+        self.default_exclude_patterns = sorted(set(default_exclude_patterns or []))
+        self.scan_session_time = scan_session_time
+        
+        # An unknown threshold reports every severity
+        self._threshold_rank = self._SEVERITY_RANK.get(self.severity_threshold, 0)
+        
+        # Compiled exclude matchers keyed by their sorted pattern tuple
+        self._exclude_matchers: Dict[Tuple[str, ...], Optional[Pattern[str]]] = {}
+        self._exclude_cache_hits = 0
+        self._exclude_cache_misses = 0
         
     def scan_directory(self, 
                       target_path: str,
@@ -57,54 +175,119 @@ class SemgrepScanner:
         Returns:
             Dictionary containing scan results
         """
-        if not Path(target_path).exists():
+        return self.scan_paths(
+            paths=[target_path],
+            exclude_patterns=exclude_patterns,
+            include_patterns=include_patterns,
+            custom_rules=custom_rules
+        )
+    
+    def scan_paths(self,
+                   paths: List[str],
+                   exclude_patterns: Optional[List[str]] = None,
+                   include_patterns: Optional[List[str]] = None,
+                   custom_rules: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Scan several files or directories with a single semgrep invocation.
+        
+        Rules are loaded and semgrep starts up once for the whole batch,
+        which is much cheaper than one invocation per path.
+        
+        Args:
+            paths: Paths of files or directories to scan
+            exclude_patterns: Patterns to exclude from scanning
+            include_patterns: Patterns to include in scanning
+            custom_rules: Path to custom semgrep rules
+            
+        Returns:
+            Dictionary containing scan results
+        """
+        if not paths:
             return {
                 "success": False,
-                "error": f"Target path does not exist: {target_path}",
+                "error": "No target paths given",
                 "issues": [],
                 "summary": {}
             }
         
+        for target_path in paths:
+            if not Path(target_path).exists():
+                return {
+                    "success": False,
+                    "error": f"Target path does not exist: {target_path}",
+                    "issues": [],
+                    "summary": {}
+                }
+        
+        target_path = ", ".join(paths)
+        
+        exclude_patterns = self._merge_exclude_patterns(exclude_patterns)
+        
+        # Drop explicitly excluded targets before starting semgrep
+        exclude_re = self._exclude_matcher(exclude_patterns)
+        if exclude_re is not None:
+            paths = [path for path in paths if not self._is_excluded(exclude_re, path)]
+            if not paths:
+                return {
+                    "success": True,
+                    "issues": [],
+                    "summary": self._generate_summary(0, {}, {}, target_path)
+                }
+        
         try:
+            # Skip semgrep entirely when no target file can match a rule
+            extensions = self._target_extensions(self._local_rule_files(custom_rules))
+            if extensions is not None and not self._has_candidate_files(paths, extensions):
+                logger.info(f"No files matching the rule languages in {target_path}; skipping semgrep")
+                return {
+                    "success": True,
+                    "issues": [],
+                    "summary": self._generate_summary(0, {}, {}, target_path)
+                }
+            
             # Build semgrep command
             cmd = self._build_semgrep_command(
-                target_path=target_path,
+                target_paths=paths,
                 exclude_patterns=exclude_patterns,
                 include_patterns=include_patterns,
                 custom_rules=custom_rules
             )
             
             logger.info(f"Running semgrep: {' '.join(cmd)}")
-            print(f"DEBUG: Scanning target path: {target_path}")
-            print(f"DEBUG: Semgrep command: {' '.join(cmd)}")
-            print(f"DEBUG: Exclude patterns: {exclude_patterns}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Scanning target path: {target_path}")
+                logger.debug(f"Exclude patterns: {exclude_patterns}")
             
             # Execute semgrep with environment variable
-            import os
-            env = os.environ.copy()
-            env['PYTHONHTTPSVERIFY'] = '0'
+            env = self._get_semgrep_env()
+            
+            if ijson is not None:
+                # Parse findings incrementally instead of buffering all output
+                return self._run_semgrep_streaming(cmd, target_path, env)
             
+            # Output stays as bytes; the JSON parser decodes it directly
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
                 timeout=self.timeout,
                 env=env
             )
             
-            print(f"DEBUG: Semgrep return code: {result.returncode}")
-            print(f"DEBUG: Semgrep stdout length: {len(result.stdout)}")
-            print(f"DEBUG: Semgrep stderr: {result.stderr[:500]}")
-            print(f"DEBUG: Semgrep stdout content: {result.stdout[:1000]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Semgrep return code: {result.returncode}")
+                logger.debug(f"Semgrep stdout length: {len(result.stdout)}")
+                logger.debug(f"Semgrep stderr: {result.stderr[:500].decode('utf-8', 'replace')}")
+                logger.debug(f"Semgrep stdout content: {result.stdout[:1000].decode('utf-8', 'replace')}")
             
             if result.returncode == 0 or result.returncode == 1:
                 # Parse successful output (0 = no findings, 1 = findings detected)
                 return self._parse_semgrep_output(result.stdout, target_path)
             else:
                 # Handle semgrep errors
-                return self._handle_semgrep_error(result.stderr, result.returncode)
+                return self._handle_semgrep_error(
+                    result.stderr.decode('utf-8', 'replace'),
+                    result.returncode
+                )
                 
         except subprocess.TimeoutExpired:
             return {
@@ -134,13 +317,117 @@ class SemgrepScanner:
         Returns:
             Dictionary containing scan results
         """
-        return self.scan_directory(
-            target_path=file_path,
+        return self.scan_paths(
+            paths=[file_path],
             custom_rules=custom_rules
         )
     
+    def scan_files_parallel(self,
+                            paths: List[str],
+                            workers: Optional[int] = None,
+                            exclude_patterns: Optional[List[str]] = None,
+                            include_patterns: Optional[List[str]] = None,
+                            custom_rules: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Scan many files or directories with several semgrep processes at once.
+        
+        The paths are split into chunks that are scanned in a process pool,
+        each chunk with a single batched semgrep invocation, and the chunk
+        results are merged into one result.
+        
+        Args:
+            paths: Paths of files or directories to scan
+            workers: Number of worker processes (defaults to the CPU count)
+            exclude_patterns: Patterns to exclude from scanning
+            include_patterns: Patterns to include in scanning
+            custom_rules: Path to custom semgrep rules
+            
+        Returns:
+            Dictionary containing the merged scan results
+        """
+        workers = workers or os.cpu_count() or 1
+        if len(paths) < 2 or workers < 2:
+            return self.scan_paths(paths, exclude_patterns, include_patterns, custom_rules)
+        
+        chunk_size = max(1, len(paths) // (workers * 4))
+        chunks = [
+            (self, paths[i:i + chunk_size], exclude_patterns, include_patterns, custom_rules)
+            for i in range(0, len(paths), chunk_size)
+        ]
+        
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            chunk_results = list(executor.map(_scan_chunk, chunks))
+        
+        return self._merge_results(chunk_results, ", ".join(paths))
+    
+    def _merge_results(self,
+                       chunk_results: List[Dict[str, Any]],
+                       target_path: str) -> Dict[str, Any]:
+        """Merge the results of separately scanned path chunks."""
+        issues = []
+        by_severity: Counter = Counter()
+        by_file: Counter = Counter()
+        errors = []
+        
+        for chunk_result in chunk_results:
+            if not chunk_result.get("success"):
+                errors.append(chunk_result.get("error", "Unknown semgrep error"))
+                continue
+            
+            issues.extend(chunk_result["issues"])
+            summary = chunk_result["summary"]
+            by_severity += Counter(summary["by_severity"])
+            by_file += Counter(summary["by_file"])
+        
+        merged = {
+            "success": not errors,
+            "issues": issues,
+            "summary": self._generate_summary(len(issues), by_severity, by_file, target_path)
+        }
+        if errors:
+            merged["error"] = "; ".join(errors)
+        return merged
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Return hit/miss counts of the compiled exclude-pattern cache."""
+        return {
+            "hits": self._exclude_cache_hits,
+            "misses": self._exclude_cache_misses,
+            "size": len(self._exclude_matchers)
+        }
+    
+    def _merge_exclude_patterns(self, exclude_patterns: Optional[List[str]]) -> List[str]:
+        """Combine per-scan and default excludes into a sorted, deduplicated list.
+        
+        A stable pattern list keeps the semgrep command identical across
+        scans with the same excludes.
+        """
+        if not exclude_patterns:
+            return self.default_exclude_patterns
+        return sorted(set(exclude_patterns).union(self.default_exclude_patterns))
+    
+    def _exclude_matcher(self, exclude_patterns: List[str]) -> Optional[Pattern[str]]:
+        """Compile exclude patterns into one regex, cached per pattern set."""
+        key = tuple(exclude_patterns)
+        if key in self._exclude_matchers:
+            self._exclude_cache_hits += 1
+            return self._exclude_matchers[key]
+        
+        self._exclude_cache_misses += 1
+        matcher = None
+        if key:
+            matcher = re.compile("|".join(fnmatch.translate(pattern) for pattern in key))
+        self._exclude_matchers[key] = matcher
+        return matcher
+    
+    @staticmethod
+    def _is_excluded(exclude_re: Pattern[str], path: str) -> bool:
+        """Check a target path, or its base name, against the exclude regex."""
+        normalized = Path(path).as_posix()
+        return bool(exclude_re.match(normalized) or exclude_re.match(os.path.basename(normalized)))
+    
     def _build_semgrep_command(self, 
-                                 target_path: str,
+                                 target_paths: List[str],
                                  exclude_patterns: Optional[List[str]] = None,
                                  include_patterns: Optional[List[str]] = None,
                                  custom_rules: Optional[str] = None) -> List[str]:
@@ -154,27 +441,11 @@ class SemgrepScanner:
         ]
         
         # Add configuration
-        if custom_rules:
-            # Check if custom_rules is a directory or file
-            if os.path.isdir(custom_rules):
-                # Load all YAML files from the directory
-                rule_files = glob.glob(os.path.join(custom_rules, "*.yml")) + glob.glob(os.path.join(custom_rules, "*.yaml"))
-                if not rule_files:
-                    raise RuntimeError(f"No YAML rules found in {custom_rules}")
-                print(f"DEBUG: Loading rule files: {rule_files}")
-                for rule_file in rule_files:
-                    command.extend(["--config", rule_file])
-            else:
-                # Single rule file
-                command.extend(["--config", custom_rules])
-        elif self.config != "auto":
+        rule_files = self._local_rule_files(custom_rules)
+        if rule_files is None:
             command.extend(["--config", self.config])
         else:
-            # Auto-load all YAML rules from semgrep_rules directory
-            rules_dir = os.path.join(os.path.dirname(__file__), "semgrep_rules")
-            rule_files = glob.glob(os.path.join(rules_dir, "*.yml")) + glob.glob(os.path.join(rules_dir, "*.yaml"))
-            if not rule_files:
-                raise RuntimeError(f"No YAML rules found in {rules_dir}")
+            logger.debug("Loading rule files: %s", rule_files)
             for rule_file in rule_files:
                 command.extend(["--config", rule_file])
         
@@ -192,39 +463,266 @@ class SemgrepScanner:
         if self.max_target_bytes:
             command.extend(["--max-target-bytes", str(self.max_target_bytes)])
         
-        # Add target path
-        command.append(target_path)
+        # Add target paths
+        command.extend(target_paths)
         
         return command
     
-    def _parse_semgrep_output(self, output: str, target_path: str) -> Dict[str, Any]:
-        """Parse semgrep JSON output."""
-        try:
-            data = json.loads(output)
+    def _local_rule_files(self, custom_rules: Optional[str] = None) -> Optional[List[str]]:
+        """Return the local rule files a scan will use.
+        
+        Returns:
+            The rule file paths, or None when rules come from a semgrep
+            registry config
             
-            # Extract results
-            results = data.get("results", [])
+        Raises:
+            RuntimeError: If a rules directory holds no YAML rules
+        """
+        if custom_rules:
+            if not os.path.isdir(custom_rules):
+                return [custom_rules]
+            rules_dir = custom_rules
+        elif self.config != "auto":
+            return None
+        else:
+            rules_dir = os.path.join(os.path.dirname(__file__), "semgrep_rules")
+        
+        rule_files = self._resolve_rule_files(rules_dir)
+        if not rule_files:
+            raise RuntimeError(f"No YAML rules found in {rules_dir}")
+        return rule_files
+    
+    @classmethod
+    def _rule_languages(cls, rule_files: List[str]) -> Optional[FrozenSet[str]]:
+        """Return the union of languages declared by the rule files.
+        
+        Each file's languages are cached by its mtime. Returns None when the
+        languages cannot be determined (PyYAML missing or unreadable rules).
+        """
+        if yaml is None:
+            return None
+        
+        languages = set()
+        for rule_file in rule_files:
+            try:
+                mtime = os.stat(rule_file).st_mtime_ns
+                cached = cls._rule_languages_cache.get(rule_file)
+                if cached is None or cached[0] != mtime:
+                    with open(rule_file, "rb") as f:
+                        document = yaml.safe_load(f) or {}
+                    file_languages = frozenset(
+                        str(language).lower()
+                        for rule in document.get("rules", [])
+                        for language in rule.get("languages", [])
+                    )
+                    cached = (mtime, file_languages)
+                    cls._rule_languages_cache[rule_file] = cached
+            except (OSError, AttributeError, TypeError, yaml.YAMLError):
+                return None
+            languages |= cached[1]
+        
+        return frozenset(languages)
+    
+    def _target_extensions(self, rule_files: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+        """Return the file extensions any of the rules can match.
+        
+        Returns None when the target files cannot be narrowed down, in which
+        case semgrep must always run.
+        """
+        if not rule_files:
+            return None
+        
+        languages = self._rule_languages(rule_files)
+        if not languages:
+            return None
+        
+        extensions = set()
+        for language in languages:
+            language_extensions = self._EXT_BY_LANG.get(language)
+            if language_extensions is None:
+                return None
+            extensions.update(language_extensions)
+        return tuple(extensions)
+    
+    @staticmethod
+    def _has_candidate_files(paths: List[str], extensions: Tuple[str, ...]) -> bool:
+        """Check whether any target file could be scanned by the rules.
+        
+        Extension-less files are counted as candidates, since semgrep may
+        detect their language from a shebang line.
+        """
+        def is_candidate(name: str) -> bool:
+            return name.endswith(extensions) or not os.path.splitext(name)[1]
+        
+        for path in paths:
+            if not os.path.isdir(path):
+                if is_candidate(os.path.basename(path)):
+                    return True
+                continue
+            
+            for _, _, file_names in os.walk(path):
+                if any(is_candidate(name) for name in file_names):
+                    return True
+        
+        return False
+    
+    @classmethod
+    def _get_semgrep_env(cls) -> Dict[str, str]:
+        """Return the environment for semgrep runs, building it only once."""
+        if cls._semgrep_env is None:
+            cls._semgrep_env = {**os.environ, "PYTHONHTTPSVERIFY": "0"}
+        return cls._semgrep_env
+    
+    @classmethod
+    def _resolve_rule_files(cls, rules_dir: str) -> List[str]:
+        """Return the YAML rule files in a directory, cached by its mtime.
+        
+        Adding, removing or renaming a rule file updates the directory
+        mtime, which invalidates the cached listing.
+        """
+        mtime = os.stat(rules_dir).st_mtime_ns
+        cached = cls._rule_files_cache.get(rules_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        rule_files = _list_rule_files(rules_dir)
+        cls._rule_files_cache[rules_dir] = (mtime, rule_files)
+        return rule_files
+    
+    def _run_semgrep_streaming(self,
+                               cmd: List[str],
+                               target_path: str,
+                               env: Dict[str, str]) -> Dict[str, Any]:
+        """Run semgrep and parse its JSON output straight from the pipe.
+        
+        stderr goes to a temporary file so a chatty semgrep cannot fill the
+        pipe and block while stdout is being consumed.
+        
+        Raises:
+            subprocess.TimeoutExpired: If semgrep exceeds the timeout
+        """
+        timed_out = threading.Event()
+        parse_failed = False
+        
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, env=env)
             
-            # Filter by severity
-            filtered_results = self._filter_by_severity(results)
+            def _kill_on_timeout():
+                timed_out.set()
+                proc.kill()
             
-            # Convert to standardized format
-            issues = []
-            for result in filtered_results:
-                issue = self._convert_semgrep_result(result)
-                issues.append(issue)
+            timer = threading.Timer(self.timeout, _kill_on_timeout)
+            timer.start()
             
-            # Generate summary
-            summary = self._generate_summary(issues, target_path)
+            try:
+                try:
+                    parsed = self._parse_semgrep_stream(proc.stdout, target_path)
+                except ijson.JSONError as e:
+                    parsed = {
+                        "success": False,
+                        "error": f"Failed to parse semgrep JSON output: {str(e)}",
+                        "issues": [],
+                        "summary": {}
+                    }
+                    parse_failed = True
+                    proc.kill()
+                finally:
+                    proc.stdout.close()
+                
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
             
-            return {
-                "success": True,
-                "issues": issues,
-                "summary": summary,
-                "raw_output": data
-            }
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, self.timeout)
+            
+            logger.debug(f"Semgrep return code: {returncode}")
             
-        except json.JSONDecodeError as e:
+            # A semgrep killed on a parse error has a negative return code
+            # that says nothing; one that exited on its own reports that
+            if (parse_failed and returncode < 0) or returncode == 0 or returncode == 1:
+                # 0 = no findings, 1 = findings detected
+                return parsed
+            
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', 'replace')
+        
+        return self._handle_semgrep_error(stderr, returncode)
+    
+    def _parse_semgrep_stream(self, stdout_fp, target_path: str) -> Dict[str, Any]:
+        """Parse semgrep JSON output incrementally from a binary stream.
+        
+        Each finding is filtered and converted as soon as it is decoded, so
+        the full semgrep document is never held in memory. The errors and
+        version are collected in the same pass, giving the same result
+        shape as _parse_semgrep_output.
+        """
+        report: Dict[str, Any] = {}
+        parsed = self._process_results(
+            self._iter_semgrep_stream(stdout_fp, report),
+            target_path
+        )
+        parsed["errors"] = report["errors"]
+        parsed["version"] = report["version"]
+        return parsed
+    
+    @classmethod
+    def _iter_semgrep_stream(cls, stdout_fp, report: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield semgrep results from a binary stream as they are decoded.
+        
+        The stream is tokenized once; its events are dispatched by prefix to
+        the builders of the results and the errors, and the version is taken
+        from its own event. Once the stream is exhausted, report holds its
+        'errors' and 'version' fields.
+        """
+        events = ijson.sendable_list()
+        parser = ijson.parse_coro(events, use_float=True)
+        
+        items_basecoro = ijson.get_backend(ijson.backend).items_basecoro
+        results = ijson.sendable_list()
+        errors = ijson.sendable_list()
+        results_builder = items_basecoro(results, "results.item")
+        errors_builder = items_basecoro(errors, "errors")
+        version = None
+        
+        while True:
+            chunk = stdout_fp.read(cls._STREAM_CHUNK_SIZE)
+            if chunk:
+                parser.send(chunk)
+            else:
+                parser.close()
+            
+            for event in events:
+                prefix = event[0]
+                if prefix.startswith("results"):
+                    results_builder.send(event)
+                elif prefix.startswith("errors"):
+                    errors_builder.send(event)
+                elif prefix == "version":
+                    version = event[2]
+            del events[:]
+            
+            yield from results
+            del results[:]
+            
+            if not chunk:
+                break
+        
+        report["errors"] = errors[0] if errors else []
+        report["version"] = version
+    
+    def _parse_semgrep_output(self, output: Union[str, bytes], target_path: str) -> Dict[str, Any]:
+        """Parse semgrep JSON output, given as raw bytes or text."""
+        try:
+            data = _json.loads(output)
+            
+            parsed = self._process_results(data.get("results", []), target_path)
+            # Keep only the small report fields; the full document is released
+            parsed["errors"] = data.get("errors", [])
+            parsed["version"] = data.get("version")
+            return parsed
+            
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             return {
                 "success": False,
                 "error": f"Failed to parse semgrep JSON output: {str(e)}",
@@ -245,95 +743,83 @@ class SemgrepScanner:
             "summary": {}
         }
     
-    def _filter_by_severity(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Filter results by severity threshold."""
-        if not self.severity_threshold or self.severity_threshold not in self.severity_levels:
-            return results
-        
-        threshold_index = self.severity_levels.index(self.severity_threshold)
-        filtered_results = []
-        
-        # Map semgrep severity to our levels
-        severity_mapping = {
-            "info": "low",
-            "warning": "medium", 
-            "error": "high"
-        }
+    def _process_results(self,
+                         results: Iterable[Dict[str, Any]],
+                         target_path: str) -> Dict[str, Any]:
+        """Filter, convert and summarize semgrep results in a single pass."""
+        severity_mapping = self._SEVERITY_MAPPING
+        severity_rank = self._SEVERITY_RANK
+        threshold_rank = self._threshold_rank
+        
+        issues = []
+        by_severity: Dict[str, int] = defaultdict(int)
+        by_file: Dict[str, int] = defaultdict(int)
         
         for result in results:
-            raw_severity = result.get("extra", {}).get("severity", "low").lower()
+            extra = result.get("extra", {})
+            raw_severity = extra.get("severity", "low").lower()
+            
+            # Filter by threshold; unknown severities rank above every
+            # threshold, so they are kept
+            if severity_rank.get(raw_severity, 4) < threshold_rank:
+                continue
+            
             # Map semgrep severity to our standard levels
             severity = severity_mapping.get(raw_severity, raw_severity)
+            file_path = result.get("path", "")
+            start = result.get("start", {})
+            end = result.get("end", {})
+            metadata = extra.get("metadata", {})
             
-            if severity in self.severity_levels:
-                severity_index = self.severity_levels.index(severity)
-                if severity_index >= threshold_index:
-                    filtered_results.append(result)
-            else:
-                # Include unknown severity results
-                filtered_results.append(result)
-        
-        return filtered_results
-    
-    def _convert_semgrep_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert semgrep result to standardized format."""
-        extra = result.get("extra", {})
-        
-        # Map semgrep severity to our standard levels
-        severity_mapping = {
-            "info": "low",
-            "warning": "medium", 
-            "error": "high"
-        }
-        raw_severity = extra.get("severity", "low").lower()
-        severity = severity_mapping.get(raw_severity, raw_severity)
+            issues.append({
+                "file": file_path,
+                "line": start.get("line", 0),
+                "column": start.get("col", 0),
+                "end_line": end.get("line", 0),
+                "end_column": end.get("col", 0),
+                "message": extra.get("message", ""),
+                "severity": severity,
+                "rule_id": result.get("check_id", ""),
+                "tool": "semgrep",
+                "confidence": extra.get("confidence", "medium"),
+                "metadata": {
+                    "rule_url": metadata.get("source", ""),
+                    "category": metadata.get("category", ""),
+                    "cwe": metadata.get("cwe", []),
+                    "owasp": metadata.get("owasp", [])
+                }
+            })
+            by_severity[severity] += 1
+            by_file[file_path] += 1
         
         return {
-            "file": result.get("path", ""),
-            "line": result.get("start", {}).get("line", 0),
-            "column": result.get("start", {}).get("col", 0),
-            "end_line": result.get("end", {}).get("line", 0),
-            "end_column": result.get("end", {}).get("col", 0),
-            "message": extra.get("message", ""),
-            "severity": severity,
-            "rule_id": result.get("check_id", ""),
-            "tool": "semgrep",
-            "confidence": extra.get("confidence", "medium"),
-            "metadata": {
-                "rule_url": extra.get("metadata", {}).get("source", ""),
-                "category": extra.get("metadata", {}).get("category", ""),
-                "cwe": extra.get("metadata", {}).get("cwe", []),
-                "owasp": extra.get("metadata", {}).get("owasp", [])
-            }
+            "success": True,
+            "issues": issues,
+            "summary": self._generate_summary(len(issues), by_severity, by_file, target_path)
         }
     
-    def _generate_summary(self, issues: List[Dict[str, Any]], target_path: str) -> Dict[str, Any]:
+    def _generate_summary(self,
+                          total_issues: int,
+                          by_severity: Dict[str, int],
+                          by_file: Dict[str, int],
+                          target_path: str) -> Dict[str, Any]:
         """Generate summary statistics."""
-        by_severity = {}
-        by_file = {}
-        
-        for issue in issues:
-            severity = issue.get("severity", "unknown")
-            file_path = issue.get("file", "")
-            
-            if severity not in by_severity:
-                by_severity[severity] = 0
-            by_severity[severity] += 1
-            
-            if file_path not in by_file:
-                by_file[file_path] = 0
-            by_file[file_path] += 1
-        
         return {
-            "total_issues": len(issues),
+            "total_issues": total_issues,
             "files_with_issues": len(by_file),
-            "by_severity": by_severity,
-            "by_file": by_file,
+            "by_severity": dict(by_severity),
+            "by_file": dict(by_file),
             "target_path": target_path,
-            "scan_time": datetime.now().isoformat()
+            "scan_time": self.scan_session_time or datetime.now().isoformat()
         }
 
 
+def _scan_chunk(args: Tuple[SemgrepScanner, List[str], Optional[List[str]], Optional[List[str]], Optional[str]]) -> Dict[str, Any]:
+    """Scan one chunk of paths; runs in a worker process of scan_files_parallel."""
+    scanner, paths, exclude_patterns, include_patterns, custom_rules = args
+    return scanner.scan_paths(paths, exclude_patterns, include_patterns, custom_rules)
+
+
 def convert_semgrep_issue_to_bug(issue: dict) -> dict:
     """
     Convert a semgrep issue to the bug schema for API import.
@@ -358,9 +844,19 @@ def convert_semgrep_issue_to_bug(issue: dict) -> dict:
         "fix_impact": None
     }
 
-def post_bugs_to_api(bugs: list, base_url: str = "http://localhost:8000/api/fixchain/import/bulk"):
+def post_bugs_to_api(bugs: list,
+                     base_url: str = "http://localhost:8000/api/fixchain/import/bulk",
+                     compress: bool = False,
+                     scan_session_time: Optional[str] = None):
     """
     Gửi batch bug lên API endpoint /bugs/import
+    
+    Args:
+        bugs: Bugs in the import schema
+        base_url: Import endpoint URL
+        compress: Send the payload gzip-compressed (Content-Encoding: gzip)
+        scan_session_time: ISO timestamp used as the import date; defaults
+            to the current time
     """
     url = "http://192.168.1.9:5000/api/fixchain/import/bulk"
     payload = {
@@ -369,23 +865,38 @@ def post_bugs_to_api(bugs: list, base_url: str = "http://localhost:8000/api/fixc
         },
         "metadata": {
             "source": "semgrep_scan",
-            "import_date": datetime.now().isoformat(),
+            "import_date": scan_session_time or datetime.now().isoformat(),
             "imported_by": "fixchain",
             "notes": "Auto import from semgrep scan"
         }
     }
-    # Log payload trước khi gửi
-    print("==== JSON BUG PAYLOAD SẼ GỬI LÊN API ====")
-    print(json.dumps(payload, indent=2, ensure_ascii=False))
-    print("==== END JSON BUG PAYLOAD ====")
+    logger.info(f"Posting {len(bugs)} bugs to {url}")
     try:
-        resp = requests.post(url, json=payload, timeout=30)
+        # Serialize once; the same bytes are logged and sent
+        body = _json.dumps(payload)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        
+        # Log payload trước khi gửi
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Bug payload: %s", body.decode("utf-8"))
+        
+        session = _get_session()
+        if compress:
+            resp = session.post(
+                url,
+                data=gzip.compress(body),
+                headers={"Content-Encoding": "gzip"},
+                timeout=30
+            )
+        else:
+            resp = session.post(url, data=body, timeout=30)
         if resp.status_code == 200:
-            print(f"✅ Imported {len(bugs)} bugs to API successfully!")
+            logger.info(f"Imported {len(bugs)} bugs to API successfully")
         else:
-            print(f"❌ Failed to import bugs! Status: {resp.status_code}, Response: {resp.text}")
+            logger.error(f"Failed to import bugs! Status: {resp.status_code}, Response: {resp.text}")
     except Exception as e:
-        print(f"❌ Exception when importing bugs: {e}")
+        logger.error(f"Exception when importing bugs: {e}")
 
 
 def scan_src_test_directory(src_test_path: str = "src_test",
@@ -399,9 +910,12 @@ def scan_src_test_directory(src_test_path: str = "src_test",
     Scan the src_test directory for security vulnerabilities.
     Optionally, post results to API.
     """
+    # One timestamp for the whole session, shared by the summary and the import
+    scan_session_time = datetime.now().isoformat()
     scanner = SemgrepScanner(
         config=config,
-        severity_threshold=severity_threshold
+        severity_threshold=severity_threshold,
+        scan_session_time=scan_session_time
     )
     if exclude_patterns is None:
         exclude_patterns = [
@@ -422,5 +936,5 @@ def scan_src_test_directory(src_test_path: str = "src_test",
     # Convert and post to API if needed
     if post_to_api and result.get("success") and result.get("issues"):
         bugs = [convert_semgrep_issue_to_bug(issue) for issue in result["issues"]]
-        post_bugs_to_api(bugs, base_url=api_base_url)
+        post_bugs_to_api(bugs, base_url=api_base_url, scan_session_time=scan_session_time)
     return result
\ No newline at end of file
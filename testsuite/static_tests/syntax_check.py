@@ -4,12 +4,32 @@ This module implements syntax checking for Python source files using the ast mod
 """
 
 import ast
+import bisect
 import os
-from typing import List, Dict, Any
+import re
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple
 from ..interfaces.test_case import ITestCase, TestResult
 from models.test_result import TestIssue, TestSeverity
 
 
+# Matches at the start of every line holding a TODO, FIXME or
+# NotImplementedError marker. Each alternative is a lookahead over the line,
+# tried in priority order, and match.lastgroup names the marker found. The
+# comment markers are matched exactly as "# todo:" and "# fixme", in any case.
+_TODO_PATTERN = re.compile(
+    rb'^(?:'
+    rb'(?=[^\n]*?(?P<TODO># todo:(?P<todo_text>[^\n]*)))'
+    rb'|(?=[^\n]*?(?P<FIXME># fixme(?P<fixme_text>[^\n]*)))'
+    rb'|(?=[^\n]*?(?P<NOT_IMPLEMENTED>(?-i:raise NotImplementedError)))'
+    rb')',
+    re.IGNORECASE | re.MULTILINE
+)
+
+_NEWLINE = re.compile(b'\n')
+
+
 class SyntaxCheckTest(ITestCase):
     """Test case for checking Python syntax errors.
     
@@ -17,6 +37,11 @@ class SyntaxCheckTest(ITestCase):
     and detect syntax errors.
     """
     
+    # Parse results keyed by (path, mtime_ns, size), shared by all instances
+    # so retries on an unchanged file skip both the read and ast.parse
+    _PARSE_CACHE: "OrderedDict[Tuple[str, int, int], tuple]" = OrderedDict()
+    _PARSE_CACHE_MAX_ENTRIES = 1024
+    
     def __init__(self, max_iterations: int = 5):
         """Initialize syntax check test.
         
@@ -47,10 +72,13 @@ class SyntaxCheckTest(ITestCase):
         """
         issues = []
         output_lines = []
+        file_size = 0
         
         try:
             # Check if file exists
-            if not os.path.exists(source_file):
+            try:
+                st = os.stat(source_file)
+            except FileNotFoundError:
                 issues.append(TestIssue(
                     file=source_file,
                     line=0,
@@ -73,19 +101,30 @@ class SyntaxCheckTest(ITestCase):
                     output="File not found"
                 )
             
-            # Read and parse the file
-            with open(source_file, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            file_size = st.st_size
+            cache_key = (source_file, st.st_mtime_ns, st.st_size)
+            cached = self._PARSE_CACHE.get(cache_key)
+            if cached is not None:
+                self._PARSE_CACHE.move_to_end(cache_key)
+                return self._build_result(
+                    source_file, attempt_id, file_size,
+                    list(cached[0]), cached[1], cached[2], list(cached[3])
+                )
+            
+            # Read raw bytes; ast.parse decodes them itself, honouring any
+            # PEP 263 coding declaration
+            with open(source_file, 'rb') as f:
+                source_bytes = f.read()
             
             output_lines.append(f"Checking syntax for: {source_file}")
             
             # Try to parse the AST
             try:
-                ast.parse(source_code, filename=source_file)
+                ast.parse(source_bytes, filename=source_file)
                 output_lines.append("[OK] Syntax check passed")
                 
                 # Check for TODO comments that simulate issues
-                todo_issues = self._check_for_todo_issues(source_code, source_file)
+                todo_issues = self._check_for_todo_issues(source_bytes, source_file)
                 issues.extend(todo_issues)
                 
                 if todo_issues:
@@ -113,6 +152,10 @@ class SyntaxCheckTest(ITestCase):
                 output_lines.append(f"[ERROR] Syntax error at line {e.lineno}: {e.msg}")
                 status = "fail"
                 summary = f"Syntax error found at line {e.lineno}: {e.msg}"
+            
+            self._PARSE_CACHE[cache_key] = (tuple(issues), status, summary, tuple(output_lines))
+            if len(self._PARSE_CACHE) > self._PARSE_CACHE_MAX_ENTRIES:
+                self._PARSE_CACHE.popitem(last=False)
                 
         except Exception as e:
             # Handle unexpected errors
@@ -132,6 +175,34 @@ class SyntaxCheckTest(ITestCase):
             status = "fail"
             summary = f"Unexpected error: {str(e)}"
         
+        return self._build_result(
+            source_file, attempt_id, file_size, issues, status, summary, output_lines
+        )
+    
+    def _build_result(
+        self,
+        source_file: str,
+        attempt_id: str,
+        file_size: int,
+        issues: List[TestIssue],
+        status: str,
+        summary: str,
+        output_lines: List[str]
+    ) -> TestResult:
+        """Assemble the TestResult for a completed check.
+        
+        Args:
+            source_file: Path to the checked file
+            attempt_id: Unique identifier for this test attempt
+            file_size: Size of the checked file in bytes
+            issues: Issues found
+            status: Test status
+            summary: Result summary
+            output_lines: Output lines to join into the result output
+            
+        Returns:
+            TestResult: Test execution result
+        """
         return TestResult(
             test_name=self.name,
             test_type=self.test_type,
@@ -144,70 +215,98 @@ class SyntaxCheckTest(ITestCase):
                 "attempt_id": attempt_id,
                 "iteration": self.current_iteration + 1,
                 "source_file": source_file,
-                "file_size": os.path.getsize(source_file) if os.path.exists(source_file) else 0
+                "file_size": file_size
             }
         )
     
-    def _check_for_todo_issues(self, source_code: str, source_file: str) -> List[TestIssue]:
+    def _check_for_todo_issues(self, source_bytes: bytes, source_file: str) -> List[TestIssue]:
         """Check for TODO comments that simulate issues.
         
+        The scan runs on the raw file bytes; only the matched line prefixes
+        and marker texts are decoded.
+        
         Args:
-            source_code: The source code content
+            source_bytes: The raw source file content
             source_file: Path to the source file
             
         Returns:
             List[TestIssue]: List of TODO-related issues
         """
         issues = []
-        lines = source_code.split('\n')
+        tool_name = self.get_tool_name()
         
-        for line_num, line in enumerate(lines, 1):
-            line_lower = line.lower().strip()
+        # Offsets of every newline, built once so each match maps to its line
+        # number with a binary search instead of recounting from the start
+        newline_offsets = array('i', [m.start() for m in _NEWLINE.finditer(source_bytes)])
+        
+        for match in _TODO_PATTERN.finditer(source_bytes):
+            line_start = match.start()
+            line_num = bisect.bisect_right(newline_offsets, line_start) + 1
+            kind = match.lastgroup
+            marker_start = match.start(kind)
             
-            # Check for various TODO patterns
-            if '# todo:' in line_lower:
-                todo_text = line.split('# todo:', 1)[1].strip() if '# todo:' in line_lower else "fix this"
+            if kind == 'TODO':
+                todo_text = match.group('todo_text').decode('utf-8', 'replace').strip()
                 issues.append(TestIssue(
                     file=source_file,
                     line=line_num,
-                    column=line.find('#'),
+                    column=self._column_of(source_bytes, line_start, b'#', marker_start + 1),
                     message=f"TODO item found: {todo_text}",
                     severity=TestSeverity.MEDIUM,
                     rule_id="TODO_FOUND",
-                    tool=self.get_tool_name(),
+                    tool=tool_name,
                     error_code="W001",
                     suggestion="Implement the TODO item or remove the comment"
                 ))
             
-            elif '# fixme' in line_lower:
-                fixme_text = line.split('# fixme', 1)[1].strip() if '# fixme' in line_lower else "fix this"
+            elif kind == 'FIXME':
+                fixme_text = match.group('fixme_text').decode('utf-8', 'replace').strip()
                 issues.append(TestIssue(
                     file=source_file,
                     line=line_num,
-                    column=line.find('#'),
+                    column=self._column_of(source_bytes, line_start, b'#', marker_start + 1),
                     message=f"FIXME item found: {fixme_text}",
                     severity=TestSeverity.HIGH,
                     rule_id="FIXME_FOUND",
-                    tool=self.get_tool_name(),
+                    tool=tool_name,
                     error_code="W002",
                     suggestion="Address the FIXME item immediately"
                 ))
             
-            elif 'raise NotImplementedError' in line:
+            else:
                 issues.append(TestIssue(
                     file=source_file,
                     line=line_num,
-                    column=line.find('raise'),
+                    column=self._column_of(source_bytes, line_start, b'raise', marker_start + 5),
                     message="Method not implemented",
                     severity=TestSeverity.HIGH,
                     rule_id="NOT_IMPLEMENTED",
-                    tool=self.get_tool_name(),
+                    tool=tool_name,
                     error_code="W003",
                     suggestion="Implement the method or remove the NotImplementedError"
                 ))
         
         return issues
     
+    @staticmethod
+    def _column_of(source_bytes: bytes, line_start: int, token: bytes, end: int) -> int:
+        """Get the character column of the first token occurrence on a line.
+        
+        Args:
+            source_bytes: The raw source file content
+            line_start: Byte offset where the line begins
+            token: Token to look for
+            end: Byte offset the search stops at
+            
+        Returns:
+            int: Zero-based column, counted in characters rather than bytes
+        """
+        token_start = source_bytes.find(token, line_start, end)
+        prefix = source_bytes[line_start:token_start]
+        if prefix.isascii():
+            return len(prefix)
+        return len(prefix.decode('utf-8', 'replace'))
+    
     def get_tool_name(self) -> str:
         """Get the tool name for this test.
         
@@ -3,32 +3,409 @@
 This module implements type checking for Python source files using mypy.
 """
 
+import asyncio
+import atexit
+import bisect
+import fnmatch
+import mmap
 import os
+import re
+import shutil
+import queue
 import subprocess
+import sys
 import json
 import tempfile
-from typing import List, Dict, Any
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Final, List, Optional, Pattern, Tuple
 from ..interfaces.test_case import ITestCase, TestResult
 from models.test_result import TestIssue, TestSeverity
+from . import _type_cache
 
+try:
+    import orjson as _json
+except ImportError:
+    _json = json  # type: ignore[misc]
 
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:
+    # Only needed when compiling with mypyc (see "make mypyc")
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Any:  # type: ignore[misc]
+        return lambda cls: cls
+
+
+# Idle seconds after which the mypy daemon shuts itself down
+_DMYPY_IDLE_TIMEOUT: Final = 3600
+
+# Private status file of this process's mypy daemon
+_dmypy_status_file: Optional[str] = None
+
+# Working directory and mypy config stamps the daemon was started with; it
+# resolves paths and reads its config relative to that directory
+_dmypy_context: Optional[Tuple[str, List[Tuple[str, int, int]]]] = None
+
+
+def _read_parallel_checks() -> int:
+    """Read the mypy concurrency limit from FIXCHAIN_TYPE_PARALLEL.
+    
+    A malformed value falls back to the CPU count and values below 1 are
+    raised to 1, so a bad setting can neither break the import nor create
+    a semaphore that never admits a check.
+    """
+    default = os.cpu_count() or 1
+    try:
+        return max(1, int(os.environ.get('FIXCHAIN_TYPE_PARALLEL', default)))
+    except ValueError:
+        return default
+
+
+# Maximum number of concurrent mypy processes; deliberately not Final, so
+# it stays a module attribute that can be changed when compiled with mypyc
+_MAX_PARALLEL_CHECKS: int = _read_parallel_checks()
+
+# Per event loop: semaphore capping concurrent mypy runs, and a lock that
+# serializes requests to the shared daemon
+_check_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_dmypy_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+# Program run by mypy worker processes: one JSON request per input line,
+# with the mypy arguments and the working directory to run them in, one
+# JSON result per output line. mypy writes to the streams it is given,
+# anything else printed goes to stderr.
+_MYPY_WORKER_SCRIPT: Final = """
+import os
+import sys
+from mypy import api
+try:
+    from orjson import dumps, loads
+except ImportError:
+    import json
+    loads = json.loads
+    def dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+out, sys.stdout = sys.stdout.buffer, sys.stderr
+for line in sys.stdin.buffer:
+    request = loads(line)
+    os.chdir(request['cwd'])
+    stdout, stderr, status = api.run(request['args'])
+    out.write(dumps({'out': stdout, 'err': stderr, 'rc': status}) + b'\\n')
+    out.flush()
+"""
+
+_worker_pool: Optional["_MypyWorkerPool"] = None
+
+# One line of mypy output: file:line[:column]: level: message  [error-code]
+# (_run_mypy passes --show-column-numbers, but the column stays optional for
+# output produced without it); the group names match the keys of mypy's
+# JSON output
+_MYPY_LINE_RE: Final = re.compile(
+    r'^(?P<file>.+?):(?P<line>\d+):(?:(?P<column>\d+):)?\s*'
+    r'(?P<severity>error|warning|note):\s*(?P<message>.*?)'
+    r'(?:\s+\[(?P<code>[\w-]+)\])?\s*$'
+)
+
+# First mypy release with machine readable --output=json
+_MYPY_JSON_OUTPUT_VERSION: Final = (1, 11)
+
+_MYPY_SEVERITIES: Final = {
+    'error': TestSeverity.HIGH,
+    'warning': TestSeverity.MEDIUM,
+    'note': TestSeverity.LOW,
+}
+
+# Fix suggestions for mypy messages, first match wins
+_SUGGESTIONS: Final = tuple((re.compile(pattern, re.IGNORECASE), suggestion) for pattern, suggestion in (
+    ('missing type annotation', "Add type annotations to the function or variable"),
+    ('incompatible types', "Check type compatibility and fix type mismatches"),
+    ('has no attribute', "Verify the attribute exists or check the object type"),
+    ('cannot be imported', "Check import statement and module availability"),
+    ('unused', "Remove unused imports or variables"),
+))
+
+# A "def" line ending in ':' with no return annotation, as checked by the
+# basic fallback when mypy is unavailable
+_DEF_NO_RETURN_RE: Final = re.compile(
+    rb'^[ \t\f]*def (?![^\n]*->)(?P<name>[^(\n]*)[^\n]*:[ \t\f\r]*$',
+    re.MULTILINE
+)
+
+_NEWLINE_RE: Final = re.compile(b'\n')
+
+# Comment that opts a file out of type checking, e.g. generated code; only
+# the start of the file is searched for it
+_SKIP_MARKER: Final = b'# fixchain: type-skip'
+_SKIP_MARKER_SCAN_BYTES: Final = 4096
+
+# Skip marker lookups keyed by path, as (mtime_ns, size, has_marker), least
+# recently used first; a matching stat lets an unchanged file skip
+# re-reading its head
+_skip_markers: "OrderedDict[str, Tuple[int, int, bool]]" = OrderedDict()
+_SKIP_MARKERS_MAX_ENTRIES: Final = 1024
+
+
+def _stop_dmypy(status_dir: str, status_file: str) -> None:
+    """Stop the mypy daemon and remove its status directory."""
+    try:
+        subprocess.run(
+            ['dmypy', '--status-file', status_file, 'stop'],
+            capture_output=True,
+            timeout=10
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    shutil.rmtree(status_dir, ignore_errors=True)
+
+
+def _get_check_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore limiting concurrent mypy runs in this event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _check_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _check_semaphores[loop] = asyncio.Semaphore(_MAX_PARALLEL_CHECKS)
+    return semaphore
+
+
+def _get_dmypy_lock() -> asyncio.Lock:
+    """Return the lock serializing mypy daemon requests in this event loop."""
+    loop = asyncio.get_running_loop()
+    lock = _dmypy_locks.get(loop)
+    if lock is None:
+        lock = _dmypy_locks[loop] = asyncio.Lock()
+    return lock
+
+
+async def _run_command(cmd: List[str], timeout: float) -> subprocess.CompletedProcess:
+    """Run a command without blocking the event loop.
+    
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds to wait before killing the process
+        
+    Returns:
+        subprocess.CompletedProcess: Completed process with raw bytes output
+        
+    Raises:
+        subprocess.TimeoutExpired: If the command exceeds the timeout
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    
+    # The process has exited, so this only reads its return code
+    returncode = await proc.wait()
+    return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+
+def _get_dmypy_status_file() -> str:
+    """Return the status file of the shared mypy daemon, creating its directory."""
+    global _dmypy_status_file
+    
+    if _dmypy_status_file is None:
+        status_dir = tempfile.mkdtemp(prefix='fixchain-dmypy-')
+        _dmypy_status_file = os.path.join(status_dir, 'dmypy.json')
+        atexit.register(_stop_dmypy, status_dir, _dmypy_status_file)
+    
+    return _dmypy_status_file
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class _MypyWorkerPool:
+    """Long-lived Python processes that run mypy through mypy.api.
+    
+    Each worker imports mypy once and then handles one check at a time,
+    reading the mypy arguments as a JSON line on stdin and answering with
+    a JSON line on stdout. Workers are plain processes driven from executor
+    threads rather than asyncio subprocesses, so they stay warm across
+    event loops. They are started on demand, up to the pool size.
+    
+    Each request carries the caller's current working directory, which the
+    worker changes to before running mypy, so relative paths and the mypy
+    config files resolve as they would for a fresh mypy process.
+    """
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._idle: "queue.SimpleQueue[subprocess.Popen]" = queue.SimpleQueue()
+        self._workers: List[subprocess.Popen] = []
+        self._lock = threading.Lock()
+    
+    def _acquire(self) -> subprocess.Popen:
+        """Take an idle worker, starting one if the pool is not full."""
+        with self._lock:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            
+            if len(self._workers) < self._size:
+                worker = subprocess.Popen(
+                    [sys.executable, '-c', _MYPY_WORKER_SCRIPT],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+                self._workers.append(worker)
+                return worker
+        
+        return self._idle.get()
+    
+    def _discard(self, worker: subprocess.Popen) -> None:
+        """Kill a worker that failed or may still be busy."""
+        worker.kill()
+        worker.wait()
+        with self._lock:
+            self._workers.remove(worker)
+    
+    @staticmethod
+    def _request(worker: subprocess.Popen, args: List[str], cwd: str) -> bytes:
+        """Send one check to a worker and wait for its reply line."""
+        assert worker.stdin is not None and worker.stdout is not None
+        worker.stdin.write(json.dumps({'args': args, 'cwd': cwd}).encode('utf-8') + b'\n')
+        worker.stdin.flush()
+        return worker.stdout.readline()
+    
+    async def run(self, args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """Run mypy with the given arguments in a worker.
+        
+        Args:
+            args: mypy command line arguments, run in the current
+                working directory
+            timeout: Seconds to wait before killing the worker
+            
+        Returns:
+            subprocess.CompletedProcess: Completed check with bytes output
+            
+        Raises:
+            subprocess.TimeoutExpired: If the check exceeds the timeout
+            RuntimeError: If the worker exited, e.g. because mypy cannot
+                be imported by this interpreter
+        """
+        loop = asyncio.get_running_loop()
+        cwd = os.getcwd()
+        worker = await loop.run_in_executor(None, self._acquire)
+        
+        try:
+            reply = await asyncio.wait_for(
+                loop.run_in_executor(None, self._request, worker, args, cwd), timeout
+            )
+        except asyncio.TimeoutError:
+            self._discard(worker)
+            raise subprocess.TimeoutExpired(['mypy'] + args, timeout)
+        except BaseException:
+            self._discard(worker)
+            raise
+        
+        if not reply:
+            self._discard(worker)
+            raise RuntimeError("mypy worker exited")
+        
+        self._idle.put(worker)
+        result = _json.loads(reply)
+        return subprocess.CompletedProcess(
+            ['mypy'] + args,
+            result['rc'],
+            result['out'].encode('utf-8'),
+            result['err'].encode('utf-8')
+        )
+    
+    def shutdown(self) -> None:
+        """Stop all workers; idle ones exit when their stdin closes."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        
+        for worker in workers:
+            if worker.stdin is not None:
+                worker.stdin.close()
+            try:
+                worker.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+
+
+def _get_worker_pool() -> _MypyWorkerPool:
+    """Return the shared mypy worker pool, creating it on first use."""
+    global _worker_pool
+    
+    if _worker_pool is None:
+        _worker_pool = _MypyWorkerPool(_MAX_PARALLEL_CHECKS)
+        atexit.register(_worker_pool.shutdown)
+    
+    return _worker_pool
+
+
+@lru_cache(maxsize=4096)
+def _get_type_suggestion(message: str) -> str:
+    """Generate suggestion based on type error message.
+    
+    Cached per message, since noisy files repeat the same diagnostics.
+    
+    Args:
+        message: Type error message
+        
+    Returns:
+        str: Suggested fix
+    """
+    for pattern, suggestion in _SUGGESTIONS:
+        if pattern.search(message):
+            return suggestion
+    return "Review and fix the type-related issue"
+
+
+# Kept a regular Python class when compiled, so instances can still be
+# patched; the method bodies are compiled either way
+@mypyc_attr(native_class=False)
 class TypeCheckTest(ITestCase):
     """Test case for checking Python type annotations and type safety.
     
     This test uses mypy to perform static type checking on Python source files.
     """
     
-    def __init__(self, max_iterations: int = 5):
+    # Tool availability and mypy version, probed once per process since
+    # they cannot change while it runs
+    _mypy_available: ClassVar[Optional[bool]] = None
+    _dmypy_available: ClassVar[Optional[bool]] = None
+    _mypy_version: ClassVar[Optional[str]] = None
+    _mypy_json_output: ClassVar[bool] = False
+    _mypy_workers_available: ClassVar[Optional[bool]] = None
+    
+    def __init__(self, max_iterations: int = 5, skip_patterns: Optional[List[str]] = None):
         """Initialize type check test.
         
         Args:
             max_iterations: Maximum number of test iterations
+            skip_patterns: Glob patterns of files that are not type checked,
+                such as generated code; matched against the path and the
+                file name
         """
         super().__init__(
             name="TypeCheck",
             test_type="static",
             max_iterations=max_iterations
         )
+        
+        # Results of earlier iterations keyed by (path, strict_mode,
+        # ignore_missing_imports), as (mtime_ns, size, issues, output);
+        # an unchanged stat skips hashing the file for the disk cache
+        self._per_file_cache: Dict[Tuple[str, bool, bool], Tuple[int, int, List[TestIssue], List[str]]] = {}
+        
+        self._skip_re: Optional[Pattern[str]] = None
+        if skip_patterns:
+            self._skip_re = re.compile("|".join(fnmatch.translate(pattern) for pattern in skip_patterns))
     
     async def run(
         self,
@@ -44,99 +421,411 @@ class TypeCheckTest(ITestCase):
             **kwargs: Additional parameters
                 - strict_mode: bool, whether to use strict type checking
                 - ignore_missing_imports: bool, whether to ignore missing import errors
+                - use_cache: bool, whether to reuse results of an earlier check of
+                  identical source with the same mypy version and options
+                  (default True); changes to imported modules are not tracked
             
         Returns:
             TestResult: Test execution result
         """
-        issues = []
-        output_lines = []
+        results = await self.run_batch([source_file], attempt_id, **kwargs)
+        return results[source_file]
+    
+    async def run_batch(
+        self,
+        source_files: List[str],
+        attempt_id: str,
+        **kwargs
+    ) -> Dict[str, TestResult]:
+        """Execute type check on several source files.
         
+        A single file is checked through the mypy daemon, which keeps the
+        type graph warm between runs. Larger batches are split into shards
+        that the mypy worker pool checks in parallel, one mypy run per
+        shard; otherwise the batch is checked in one run. The reported
+        issues are then split back per file.
+        Issues that mypy reports for modules outside the checked files are
+        only attributed when a single file is checked.
+        
+        Args:
+            source_files: Paths to the Python files to check
+            attempt_id: Unique identifier for this test attempt
+            **kwargs: Additional parameters, as for run()
+            
+        Returns:
+            Dict[str, TestResult]: Test execution result per source file
+        """
         # Get configuration options
         strict_mode = kwargs.get('strict_mode', False)
         ignore_missing_imports = kwargs.get('ignore_missing_imports', True)
         
-        try:
-            # Check if file exists
-            if not os.path.exists(source_file):
-                issues.append(TestIssue(
-                    file=source_file,
-                    line=0,
-                    column=0,
-                    message=f"File not found: {source_file}",
-                    severity=TestSeverity.CRITICAL,
-                    rule_id="FILE_NOT_FOUND",
-                    tool=self.get_tool_name(),
-                    error_code="T001",
-                    suggestion="Ensure the file path is correct and the file exists"
-                ))
-                
-                return TestResult(
+        tool_name = self.get_tool_name()
+        results: Dict[str, TestResult] = {}
+        output_lines: Dict[str, List[str]] = {}
+        stats: Dict[str, os.stat_result] = {}
+        
+        for source_file in source_files:
+            # Check if file exists, keeping the stat for the caches
+            try:
+                stats[source_file] = os.stat(source_file)
+            except OSError:
+                results[source_file] = TestResult(
                     test_name=self.name,
                     test_type=self.test_type,
-                    issues=issues,
+                    issues=[TestIssue(
+                        file=source_file,
+                        line=0,
+                        column=0,
+                        message=f"File not found: {source_file}",
+                        severity=TestSeverity.CRITICAL,
+                        rule_id="FILE_NOT_FOUND",
+                        tool=tool_name,
+                        error_code="T001",
+                        suggestion="Ensure the file path is correct and the file exists"
+                    )],
                     summary=f"File not found: {source_file}",
                     status="fail",
-                    tool=self.get_tool_name(),
+                    tool=tool_name,
                     output="File not found"
                 )
+                continue
             
-            output_lines.append(f"Type checking: {source_file}")
-            
-            # Check if mypy is available
-            if not self._is_mypy_available():
+            if self._is_skipped(source_file, stats[source_file]):
+                results[source_file] = self._build_result(
+                    source_file,
+                    attempt_id,
+                    [],
+                    "pass",
+                    "skipped",
+                    [f"Type checking: {source_file}", "Type check skipped"],
+                    strict_mode,
+                    ignore_missing_imports
+                )
+            else:
+                output_lines[source_file] = [f"Type checking: {source_file}"]
+        
+        try:
+            if output_lines and not self._is_mypy_available():
                 # Fallback to basic type annotation checking
-                output_lines.append("mypy not available, using basic type annotation check")
-                return await self._basic_type_check(source_file, attempt_id, output_lines)
+                for source_file, lines in output_lines.items():
+                    lines.append("mypy not available, using basic type annotation check")
+                    results[source_file] = await self._basic_type_check(
+                        source_file, attempt_id, lines, stats[source_file]
+                    )
+                output_lines = {}
             
-            # Run mypy
-            mypy_result = await self._run_mypy(source_file, strict_mode, ignore_missing_imports)
+            mypy_results: Dict[str, Dict[str, Any]] = {}
+            cache_keys: Dict[str, str] = {}
+            stamps: Dict[str, Tuple[int, int]] = {}
             
-            if mypy_result['success']:
-                issues.extend(mypy_result['issues'])
-                output_lines.extend(mypy_result['output'])
-                
-                if issues:
-                    status = "fail"
-                    summary = f"Found {len(issues)} type checking issues"
-                else:
-                    status = "pass"
-                    summary = "No type checking issues found"
-            else:
-                # mypy execution failed
-                issues.append(TestIssue(
-                    file=source_file,
-                    line=0,
-                    column=0,
-                    message=f"Type checker execution failed: {mypy_result['error']}",
-                    severity=TestSeverity.HIGH,
-                    rule_id="TOOL_ERROR",
-                    tool=self.get_tool_name(),
-                    error_code="T002",
-                    suggestion="Check mypy installation and configuration"
+            # Reuse the results of identical earlier checks, first from this
+            # instance's earlier iterations, then from the disk cache
+            if kwargs.get('use_cache', True):
+                for source_file, lines in output_lines.items():
+                    st = stats[source_file]
+                    stamps[source_file] = (st.st_mtime_ns, st.st_size)
+                    cached = self._get_iteration_result(
+                        source_file, stamps[source_file], strict_mode, ignore_missing_imports
+                    )
+                    
+                    if cached is None:
+                        cache_key = _type_cache.make_key(
+                            source_file, self._mypy_version, strict_mode, ignore_missing_imports
+                        )
+                        cache_keys[source_file] = cache_key
+                        cached = _type_cache.get(cache_key)
+                        if cached is not None:
+                            self._put_iteration_result(
+                                source_file, stamps[source_file], strict_mode,
+                                ignore_missing_imports, cached['issues'], cached['output']
+                            )
+                    
+                    if cached is not None:
+                        lines.append("Using cached type check results")
+                        mypy_results[source_file] = {
+                            'success': True,
+                            'issues': cached['issues'],
+                            'output': cached['output'],
+                            'error': None
+                        }
+            
+            to_check = [source_file for source_file in output_lines if source_file not in mypy_results]
+            if to_check:
+                # Check the files without cached results, in parallel shards
+                # when there are several
+                shards = self._shard_files(to_check)
+                shard_results = await asyncio.gather(*(
+                    self._run_mypy(
+                        shard, strict_mode, ignore_missing_imports, use_daemon=len(shards) == 1
+                    )
+                    for shard in shards
                 ))
                 
-                output_lines.append(f"[ERROR] mypy execution failed: {mypy_result['error']}")
-                status = "fail"
-                summary = f"Type checker execution failed: {mypy_result['error']}"
+                for shard, mypy_result in zip(shards, shard_results):
+                    if not mypy_result['success']:
+                        for source_file in shard:
+                            mypy_results[source_file] = mypy_result
+                        continue
+                    
+                    issues_by_file = self._split_issues_by_file(
+                        mypy_result['issues'], mypy_result['diagnostics'], shard
+                    )
+                    
+                    for source_file in shard:
+                        # Each file reports only its own diagnostics and count
+                        file_issues, file_diagnostics = issues_by_file[source_file]
+                        file_output = self._format_mypy_output(
+                            file_issues, file_diagnostics, mypy_result['stderr'], mypy_result['returncode']
+                        )
+                        mypy_results[source_file] = {
+                            **mypy_result, 'issues': file_issues, 'output': file_output
+                        }
+                        
+                        if source_file in cache_keys:
+                            _type_cache.put(cache_keys[source_file], file_issues, file_output)
+                            self._put_iteration_result(
+                                source_file, stamps[source_file], strict_mode,
+                                ignore_missing_imports, file_issues, file_output
+                            )
+            
+            for source_file, lines in output_lines.items():
+                results[source_file] = self._build_mypy_result(
+                    source_file, attempt_id, mypy_results[source_file], lines,
+                    strict_mode, ignore_missing_imports
+                )
                 
         except Exception as e:
             # Handle unexpected errors
+            for source_file, lines in output_lines.items():
+                lines.append(f"[ERROR] Unexpected error: {str(e)}")
+                results[source_file] = self._build_result(
+                    source_file,
+                    attempt_id,
+                    [TestIssue(
+                        file=source_file,
+                        line=0,
+                        column=0,
+                        message=f"Unexpected error during type check: {str(e)}",
+                        severity=TestSeverity.HIGH,
+                        rule_id="UNEXPECTED_ERROR",
+                        tool=tool_name,
+                        error_code="T003",
+                        suggestion="Check file permissions and mypy installation"
+                    )],
+                    "fail",
+                    f"Unexpected error: {str(e)}",
+                    lines,
+                    strict_mode,
+                    ignore_missing_imports
+                )
+        
+        return {source_file: results[source_file] for source_file in source_files}
+    
+    def _is_skipped(self, source_file: str, st: Optional[os.stat_result] = None) -> bool:
+        """Check whether a file is excluded from type checking.
+        
+        A file is skipped when it matches one of the skip patterns or has
+        the skip marker comment near its top. The marker lookup is memoized
+        per path, for the most recently checked files, and only repeated
+        when the file's mtime or size changes.
+        
+        Args:
+            source_file: Path to the file
+            st: Stat result of the file, if already taken
+            
+        Returns:
+            bool: True if the file should not be type checked
+        """
+        if self._skip_re is not None:
+            normalized = Path(source_file).as_posix()
+            if self._skip_re.match(normalized) or self._skip_re.match(os.path.basename(normalized)):
+                return True
+        
+        try:
+            if st is None:
+                st = os.stat(source_file)
+            cached = _skip_markers.get(source_file)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                _skip_markers.move_to_end(source_file)
+                return cached[2]
+            
+            with open(source_file, 'rb') as f:
+                has_marker = _SKIP_MARKER in f.read(_SKIP_MARKER_SCAN_BYTES)
+        except OSError:
+            return False
+        
+        _skip_markers[source_file] = (st.st_mtime_ns, st.st_size, has_marker)
+        _skip_markers.move_to_end(source_file)
+        if len(_skip_markers) > _SKIP_MARKERS_MAX_ENTRIES:
+            _skip_markers.popitem(last=False)
+        return has_marker
+    
+    def _get_iteration_result(
+        self,
+        source_file: str,
+        stamp: Tuple[int, int],
+        strict_mode: bool,
+        ignore_missing_imports: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Look up the result of an earlier iteration on an unchanged file.
+        
+        Args:
+            source_file: Path to the checked file
+            stamp: Current (mtime_ns, size) of the file
+            strict_mode: Whether strict mode is used
+            ignore_missing_imports: Whether missing imports are ignored
+            
+        Returns:
+            Dict with 'issues' and 'output', or None if the file changed
+            or was not checked with these options before
+        """
+        hit = self._per_file_cache.get((source_file, strict_mode, ignore_missing_imports))
+        if hit is None or hit[:2] != stamp:
+            return None
+        return {'issues': hit[2], 'output': hit[3]}
+    
+    def _put_iteration_result(
+        self,
+        source_file: str,
+        stamp: Tuple[int, int],
+        strict_mode: bool,
+        ignore_missing_imports: bool,
+        issues: List[TestIssue],
+        output: List[str]
+    ) -> None:
+        """Remember the result of checking a file for later iterations.
+        
+        Args:
+            source_file: Path to the checked file
+            stamp: (mtime_ns, size) of the file when it was checked
+            strict_mode: Whether strict mode was used
+            ignore_missing_imports: Whether missing imports were ignored
+            issues: Issues found
+            output: Output lines of the check
+        """
+        self._per_file_cache[(source_file, strict_mode, ignore_missing_imports)] = (
+            stamp[0], stamp[1], issues, output
+        )
+    
+    def _split_issues_by_file(
+        self,
+        issues: List[TestIssue],
+        diagnostics: List[str],
+        source_files: List[str]
+    ) -> Dict[str, Tuple[List[TestIssue], List[str]]]:
+        """Group issues from a batched mypy run by the checked file.
+        
+        Args:
+            issues: Issues parsed from the mypy output
+            diagnostics: mypy output of each issue, in the same order
+            source_files: Files passed to mypy
+            
+        Returns:
+            Dict[str, Tuple[List[TestIssue], List[str]]]: Issues and their
+            mypy output per source file
+        """
+        if len(source_files) == 1:
+            return {source_files[0]: (list(issues), list(diagnostics))}
+        
+        # mypy prints files below the working directory relative to it, so
+        # compare absolute paths
+        by_path = {os.path.abspath(source_file): source_file for source_file in source_files}
+        issues_by_file: Dict[str, Tuple[List[TestIssue], List[str]]] = {
+            source_file: ([], []) for source_file in source_files
+        }
+        
+        for issue, diagnostic in zip(issues, diagnostics):
+            source_file = by_path.get(os.path.abspath(issue.file))
+            if source_file is not None:
+                file_issues, file_diagnostics = issues_by_file[source_file]
+                file_issues.append(issue)
+                file_diagnostics.append(diagnostic)
+        
+        return issues_by_file
+    
+    def _build_mypy_result(
+        self,
+        source_file: str,
+        attempt_id: str,
+        mypy_result: Dict[str, Any],
+        output_lines: List[str],
+        strict_mode: bool,
+        ignore_missing_imports: bool
+    ) -> TestResult:
+        """Build the TestResult of a file from its mypy results.
+        
+        Args:
+            source_file: Path to the checked file
+            attempt_id: Test attempt ID
+            mypy_result: Result of the mypy run for this file
+            output_lines: Output lines to append to
+            strict_mode: Whether strict mode was used
+            ignore_missing_imports: Whether missing imports were ignored
+            
+        Returns:
+            TestResult: Test execution result
+        """
+        issues: List[TestIssue] = []
+        
+        if mypy_result['success']:
+            issues.extend(mypy_result['issues'])
+            output_lines.extend(mypy_result['output'])
+            
+            if issues:
+                status = "fail"
+                summary = f"Found {len(issues)} type checking issues"
+            else:
+                status = "pass"
+                summary = "No type checking issues found"
+        else:
+            # mypy execution failed
             issues.append(TestIssue(
                 file=source_file,
                 line=0,
                 column=0,
-                message=f"Unexpected error during type check: {str(e)}",
+                message=f"Type checker execution failed: {mypy_result['error']}",
                 severity=TestSeverity.HIGH,
-                rule_id="UNEXPECTED_ERROR",
+                rule_id="TOOL_ERROR",
                 tool=self.get_tool_name(),
-                error_code="T003",
-                suggestion="Check file permissions and mypy installation"
+                error_code="T002",
+                suggestion="Check mypy installation and configuration"
             ))
             
-            output_lines.append(f"[ERROR] Unexpected error: {str(e)}")
+            output_lines.append(f"[ERROR] mypy execution failed: {mypy_result['error']}")
             status = "fail"
-            summary = f"Unexpected error: {str(e)}"
+            summary = f"Type checker execution failed: {mypy_result['error']}"
         
+        return self._build_result(
+            source_file, attempt_id, issues, status, summary, output_lines,
+            strict_mode, ignore_missing_imports
+        )
+    
+    def _build_result(
+        self,
+        source_file: str,
+        attempt_id: str,
+        issues: List[TestIssue],
+        status: str,
+        summary: str,
+        output_lines: List[str],
+        strict_mode: bool,
+        ignore_missing_imports: bool
+    ) -> TestResult:
+        """Assemble the TestResult for a checked file.
+        
+        Args:
+            source_file: Path to the checked file
+            attempt_id: Test attempt ID
+            issues: Issues found
+            status: Test status
+            summary: Result summary
+            output_lines: Output lines to join into the result output
+            strict_mode: Whether strict mode was used
+            ignore_missing_imports: Whether missing imports were ignored
+            
+        Returns:
+            TestResult: Test execution result
+        """
         return TestResult(
             test_name=self.name,
             test_type=self.test_type,
@@ -154,80 +843,177 @@ class TypeCheckTest(ITestCase):
             }
         )
     
+    def _is_dmypy_available(self) -> bool:
+        """Check if the mypy daemon client is available in the system.
+        
+        Returns:
+            bool: True if dmypy is available
+        """
+        if TypeCheckTest._dmypy_available is None:
+            try:
+                result = subprocess.run(
+                    ['dmypy', '--version'],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                TypeCheckTest._dmypy_available = result.returncode == 0
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                TypeCheckTest._dmypy_available = False
+        
+        return TypeCheckTest._dmypy_available
+    
     def _is_mypy_available(self) -> bool:
         """Check if mypy is available in the system.
         
         Returns:
             bool: True if mypy is available
         """
-        try:
-            result = subprocess.run(
-                ['mypy', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        if TypeCheckTest._mypy_available is None:
+            try:
+                result = subprocess.run(
+                    ['mypy', '--version'],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                TypeCheckTest._mypy_version = result.stdout.strip()
+                version = re.search(r'(\d+)\.(\d+)', result.stdout)
+                TypeCheckTest._mypy_json_output = version is not None and (
+                    (int(version.group(1)), int(version.group(2))) >= _MYPY_JSON_OUTPUT_VERSION
+                )
+                TypeCheckTest._mypy_available = result.returncode == 0
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                TypeCheckTest._mypy_available = False
+        
+        return TypeCheckTest._mypy_available
+    
+    def _can_use_mypy_workers(self) -> bool:
+        """Check if mypy can run in worker processes of this interpreter.
+        
+        Workers import mypy into this interpreter, which must be the same
+        mypy version as the command line tool so results and output format
+        match the probed version.
+        
+        Returns:
+            bool: True if the worker pool can be used
+        """
+        if TypeCheckTest._mypy_workers_available is None:
+            try:
+                from mypy.version import __version__
+            except ImportError:
+                TypeCheckTest._mypy_workers_available = False
+            else:
+                version = (self._mypy_version or '').split()
+                TypeCheckTest._mypy_workers_available = version[1:2] == [__version__]
+        
+        return TypeCheckTest._mypy_workers_available
+    
+    def _shard_files(self, source_files: List[str]) -> List[List[str]]:
+        """Split files into shards for parallel checking in the worker pool.
+        
+        Every shard holds at least two files, so issues in modules outside
+        the checked files are dropped exactly as in one run for the batch.
+        
+        Args:
+            source_files: Paths to the files to check
+            
+        Returns:
+            List[List[str]]: Up to _MAX_PARALLEL_CHECKS shards, or a single
+            one when there are too few files or workers cannot be used
+        """
+        count = min(_MAX_PARALLEL_CHECKS, len(source_files) // 2)
+        if count < 2 or not self._can_use_mypy_workers():
+            return [source_files]
+        
+        return [source_files[index::count] for index in range(count)]
     
     async def _run_mypy(
         self,
-        source_file: str,
+        source_files: List[str],
         strict_mode: bool,
-        ignore_missing_imports: bool
+        ignore_missing_imports: bool,
+        use_daemon: bool = True
     ) -> Dict[str, Any]:
-        """Run mypy on the source file.
+        """Run mypy on the source files in a single invocation.
         
         Args:
-            source_file: Path to the file to check
+            source_files: Paths to the files to check
             strict_mode: Whether to use strict mode
             ignore_missing_imports: Whether to ignore missing imports
+            use_daemon: Whether to try the mypy daemon first; parallel
+                shards skip it, as it handles one request at a time
             
         Returns:
             Dict containing success status, issues, output, and error
         """
         try:
-            # Build mypy command
-            cmd = ['mypy', '--show-error-codes', '--no-error-summary']
+            # Build mypy options; the daemon requires --local-partial-types,
+            # so every way of running mypy uses it to give the same results
+            flags = [
+                '--show-error-codes', '--no-error-summary', '--local-partial-types',
+                '--hide-error-context', '--no-pretty', '--no-color-output'
+            ]
+            
+            # Request columns in text mode too, so issues report the same
+            # positions whichever way mypy was run
+            if self._mypy_json_output:
+                flags.append('--output=json')
+            else:
+                flags.append('--show-column-numbers')
             
             if strict_mode:
-                cmd.append('--strict')
+                flags.append('--strict')
             
             if ignore_missing_imports:
-                cmd.append('--ignore-missing-imports')
+                flags.append('--ignore-missing-imports')
             
-            cmd.append(source_file)
+            # mypy still prints files below the working directory relative
+            # to it, so the issues name files as before
+            paths = [os.path.abspath(source_file) for source_file in source_files]
             
-            # Run mypy
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = None
+            if use_daemon and self._is_dmypy_available():
+                # Check through the daemon, which keeps the type graph of
+                # already analysed modules warm between runs
+                result = await self._run_dmypy(flags, paths)
+            
+            if result is None:
+                async with _get_check_semaphore():
+                    if self._can_use_mypy_workers():
+                        # Check in a worker that has already imported mypy
+                        try:
+                            result = await _get_worker_pool().run(flags + paths, timeout=30)
+                        except RuntimeError:
+                            TypeCheckTest._mypy_workers_available = False
+                    
+                    if result is None:
+                        # Run mypy
+                        result = await _run_command(['mypy'] + flags + paths, timeout=30)
             
-            issues = []
-            output_lines = []
+            issues: List[TestIssue] = []
+            diagnostics: List[str] = []
+            stderr = ''
             
-            if result.stdout:
-                output_lines.append("mypy output:")
-                issues.extend(self._parse_mypy_output(result.stdout, source_file))
-                output_lines.extend(result.stdout.split('\n'))
+            # A clean run usually prints nothing, so blank output is neither
+            # decoded nor parsed. Anything else is parsed even on exit code 0,
+            # which mypy also uses when it only reports notes.
+            if result.stdout.strip():
+                stdout = result.stdout.decode('utf-8', 'replace')
+                issues = self._parse_mypy_output(
+                    stdout.splitlines(), self._mypy_json_output, source_files, diagnostics
+                )
             
             if result.stderr:
-                output_lines.append("mypy errors:")
-                output_lines.extend(result.stderr.split('\n'))
-            
-            if result.returncode == 0:
-                output_lines.append("[OK] Type check passed")
-            else:
-                output_lines.append(f"[ERROR] Type check failed with {len(issues)} issues")
+                stderr = result.stderr.decode('utf-8', 'replace').rstrip('\r\n')
             
             return {
                 'success': True,
                 'issues': issues,
-                'output': output_lines,
+                'diagnostics': diagnostics,
+                'stderr': stderr,
+                'returncode': result.returncode,
+                'output': self._format_mypy_output(issues, diagnostics, stderr, result.returncode),
                 'error': None
             }
             
@@ -246,112 +1032,227 @@ class TypeCheckTest(ITestCase):
                 'error': str(e)
             }
     
-    def _parse_mypy_output(self, output: str, source_file: str) -> List[TestIssue]:
+    def _format_mypy_output(
+        self,
+        issues: List[TestIssue],
+        diagnostics: List[str],
+        stderr: str,
+        returncode: int
+    ) -> List[str]:
+        """Build the output lines reporting a mypy run.
+        
+        When a batch was checked in one run, this is called per file with
+        that file's issues only, so each file reports its own diagnostics
+        and passes when mypy's errors were all in other files.
+        
+        Args:
+            issues: Issues to report
+            diagnostics: mypy output of each issue
+            stderr: Decoded mypy error output
+            returncode: mypy exit code
+            
+        Returns:
+            List[str]: Output lines
+        """
+        output_lines: List[str] = []
+        
+        if diagnostics:
+            output_lines.append("mypy output:")
+            output_lines.append("\n".join(diagnostics))
+        
+        if stderr:
+            output_lines.append("mypy errors:")
+            output_lines.append(stderr)
+        
+        # mypy exits with 1 when it reported errors, and with 2 when it
+        # could not check at all
+        failed = returncode != 0 and (
+            returncode != 1 or any(issue.severity == TestSeverity.HIGH for issue in issues)
+        )
+        if failed:
+            output_lines.append(f"[ERROR] Type check failed with {len(issues)} issues")
+        else:
+            output_lines.append("[OK] Type check passed")
+        
+        return output_lines
+    
+    async def _run_dmypy(
+        self,
+        flags: List[str],
+        source_files: List[str]
+    ) -> Optional[subprocess.CompletedProcess]:
+        """Check files through the mypy daemon.
+        
+        The daemon is started on first use and restarted by dmypy whenever
+        the options change. It is stopped, so that the next run starts a
+        fresh one, when the working directory or the mypy config files
+        changed since it was started. A run that fails because the daemon
+        died is retried once. The daemon answers one request at a time, so
+        requests are serialized.
+        
+        Args:
+            flags: mypy command line options
+            source_files: Paths to the files to check
+            
+        Returns:
+            The completed dmypy run, or None if the daemon could not be used
+        """
+        global _dmypy_context
+        
+        status_file = _get_dmypy_status_file()
+        cmd = [
+            'dmypy', '--status-file', status_file,
+            'run', '--timeout', str(_DMYPY_IDLE_TIMEOUT), '--'
+        ] + flags + source_files
+        
+        async with _get_dmypy_lock():
+            context = (os.getcwd(), _type_cache.config_stamps())
+            if _dmypy_context is not None and _dmypy_context != context:
+                try:
+                    await _run_command(['dmypy', '--status-file', status_file, 'stop'], timeout=10)
+                except (subprocess.TimeoutExpired, OSError):
+                    pass
+            _dmypy_context = context
+            
+            for _ in range(2):
+                result = await _run_command(cmd, timeout=30)
+                
+                # dmypy exits with 2 when the daemon itself failed
+                if result.returncode != 2 or b'daemon' not in result.stderr.lower():
+                    return result
+        
+        return None
+    
+    def _parse_mypy_output(
+        self,
+        lines: List[str],
+        json_output: bool = False,
+        source_files: Optional[List[str]] = None,
+        diagnostics: Optional[List[str]] = None
+    ) -> List[TestIssue]:
         """Parse mypy output to extract issues.
         
         Args:
-            output: mypy output text
-            source_file: Source file being checked
+            lines: mypy output lines
+            json_output: Whether mypy ran with --output=json, which prints
+                one JSON object per issue
+            source_files: Files passed to mypy; when there are several,
+                issues in other modules are dropped, as
+                _split_issues_by_file would not attribute them
+            diagnostics: List to append the mypy output of each returned
+                issue to, in the same order; JSON output is rendered as
+                mypy prints it in text mode
             
         Returns:
             List[TestIssue]: Parsed issues
         """
-        issues = []
-        lines = output.strip().split('\n')
+        tool_name = self.get_tool_name()
+        issues: List[TestIssue] = []
+        
+        # Whether each path printed by mypy is one of the checked files
+        wanted: Optional[Dict[str, bool]] = None
+        if source_files is not None and len(source_files) > 1:
+            targets = frozenset(os.path.abspath(source_file) for source_file in source_files)
+            wanted = {}
         
         for line in lines:
-            if not line.strip():
+            if not line:
                 continue
-                
-            # Parse mypy output format: file:line:column: level: message [error-code]
-            parts = line.split(':', 3)
-            if len(parts) >= 4:
+            
+            if json_output:
+                # Skips dmypy status lines such as "Daemon started"
+                if not line.startswith('{'):
+                    continue
                 try:
-                    file_path = parts[0]
-                    line_num = int(parts[1]) if parts[1].isdigit() else 0
-                    column_num = int(parts[2]) if parts[2].isdigit() else 0
-                    message_part = parts[3].strip()
-                    
-                    # Extract error level and message
-                    if message_part.startswith('error:'):
-                        severity = TestSeverity.HIGH
-                        message = message_part[6:].strip()
-                    elif message_part.startswith('warning:'):
-                        severity = TestSeverity.MEDIUM
-                        message = message_part[8:].strip()
-                    elif message_part.startswith('note:'):
-                        severity = TestSeverity.LOW
-                        message = message_part[5:].strip()
-                    else:
-                        severity = TestSeverity.MEDIUM
-                        message = message_part
-                    
-                    # Extract error code if present
-                    error_code = None
-                    if '[' in message and ']' in message:
-                        start = message.rfind('[')
-                        end = message.rfind(']')
-                        if start < end:
-                            error_code = message[start+1:end]
-                            message = message[:start].strip()
-                    
-                    issues.append(TestIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=column_num,
-                        message=message,
-                        severity=severity,
-                        rule_id=error_code or "TYPE_ERROR",
-                        tool=self.get_tool_name(),
-                        error_code=error_code or "T100",
-                        suggestion=self._get_type_suggestion(message)
-                    ))
-                    
-                except (ValueError, IndexError):
-                    # If parsing fails, create a generic issue
-                    issues.append(TestIssue(
-                        file=source_file,
-                        line=0,
-                        column=0,
-                        message=f"Unparsed mypy output: {line}",
-                        severity=TestSeverity.LOW,
-                        rule_id="PARSE_ERROR",
-                        tool=self.get_tool_name(),
-                        error_code="T999",
-                        suggestion="Review mypy output manually"
-                    ))
+                    fields = _json.loads(line)
+                except ValueError:
+                    continue
+                
+                # JSON columns are 0-based and -1 when unknown; text output
+                # columns are 1-based
+                column = fields.get('column')
+                column = column + 1 if column is not None and column >= 0 else 0
+            else:
+                match = _MYPY_LINE_RE.match(line)
+                if match is None:
+                    continue
+                
+                fields = match.groupdict()
+                column = int(fields['column']) if fields['column'] else 0
+            
+            if wanted is not None:
+                path = fields['file']
+                keep = wanted.get(path)
+                if keep is None:
+                    keep = wanted[path] = os.path.abspath(path) in targets
+                if not keep:
+                    continue
+            
+            issues.append(self._make_issue(fields, column, tool_name))
+            if diagnostics is not None:
+                diagnostics.append(self._format_diagnostic(fields, column) if json_output else line)
         
         return issues
     
-    def _get_type_suggestion(self, message: str) -> str:
-        """Generate suggestion based on type error message.
+    def _format_diagnostic(self, fields: Dict[str, Any], column: int) -> str:
+        """Render a diagnostic from mypy's JSON output as a readable line.
+        
+        The line matches mypy's text output; the hint mypy attaches to a
+        diagnostic follows as note lines at the same position.
         
         Args:
-            message: Type error message
+            fields: Diagnostic with file, line, severity, message, code
+                and hint
+            column: 1-based column, 0 if unknown
             
         Returns:
-            str: Suggested fix
+            str: Rendered diagnostic, one line per note
         """
-        message_lower = message.lower()
-        
-        if 'missing type annotation' in message_lower:
-            return "Add type annotations to the function or variable"
-        elif 'incompatible types' in message_lower:
-            return "Check type compatibility and fix type mismatches"
-        elif 'has no attribute' in message_lower:
-            return "Verify the attribute exists or check the object type"
-        elif 'cannot be imported' in message_lower:
-            return "Check import statement and module availability"
-        elif 'unused' in message_lower:
-            return "Remove unused imports or variables"
-        else:
-            return "Review and fix the type-related issue"
+        location = f"{fields['file']}:{fields['line']}"
+        if column:
+            location += f":{column}"
+        
+        line = f"{location}: {fields['severity']}: {fields['message']}"
+        if fields.get('code') and fields['severity'] != 'note':
+            line += f"  [{fields['code']}]"
+        
+        hint = fields.get('hint')
+        if hint:
+            line += "".join(f"\n{location}: note: {note}" for note in hint.splitlines())
+        return line
+    
+    def _make_issue(self, fields: Dict[str, Any], column: int, tool_name: str) -> TestIssue:
+        """Convert one parsed mypy diagnostic into a TestIssue.
+        
+        Args:
+            fields: Diagnostic with file, line, severity, message and code
+            column: 1-based column, 0 if unknown
+            tool_name: Tool name to report
+            
+        Returns:
+            TestIssue: The issue
+        """
+        message = fields['message']
+        error_code = fields.get('code')
+        
+        return TestIssue(
+            file=fields['file'],
+            line=int(fields['line']),
+            column=column,
+            message=message,
+            severity=_MYPY_SEVERITIES.get(fields['severity'], TestSeverity.MEDIUM),
+            rule_id=error_code or "TYPE_ERROR",
+            tool=tool_name,
+            error_code=error_code or "T100",
+            suggestion=_get_type_suggestion(message)
+        )
     
     async def _basic_type_check(
         self,
         source_file: str,
         attempt_id: str,
-        output_lines: List[str]
+        output_lines: List[str],
+        st: os.stat_result
     ) -> TestResult:
         """Perform basic type annotation checking when mypy is not available.
         
@@ -359,40 +1260,19 @@ class TypeCheckTest(ITestCase):
             source_file: Path to the file to check
             attempt_id: Test attempt ID
             output_lines: Output lines to append to
+            st: Stat of the file
             
         Returns:
             TestResult: Basic type check result
         """
-        issues = []
+        issues: List[TestIssue] = []
         
         try:
-            with open(source_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            
-            # Basic checks for type annotations
-            for line_num, line in enumerate(lines, 1):
-                line_stripped = line.strip()
-                
-                # Check for function definitions without type annotations
-                if line_stripped.startswith('def ') and '->' not in line:
-                    if not line_stripped.endswith(':'):
-                        continue
-                    
-                    func_name = line_stripped.split('(')[0].replace('def ', '')
-                    if not func_name.startswith('_'):  # Skip private methods
-                        issues.append(TestIssue(
-                            file=source_file,
-                            line=line_num,
-                            column=0,
-                            message=f"Function '{func_name}' missing return type annotation",
-                            severity=TestSeverity.LOW,
-                            rule_id="MISSING_RETURN_TYPE",
-                            tool=self.get_tool_name(),
-                            error_code="T200",
-                            suggestion="Add return type annotation using -> syntax"
-                        ))
+            with open(source_file, 'rb') as f:
+                # mmap cannot map an empty file, and there is nothing to check
+                if st.st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        self._find_missing_return_types(source_file, content, issues)
             
             output_lines.append(f"Basic type check completed, found {len(issues)} issues")
             
@@ -435,6 +1315,40 @@ class TypeCheckTest(ITestCase):
             }
         )
     
+    def _find_missing_return_types(
+        self,
+        source_file: str,
+        content: mmap.mmap,
+        issues: List[TestIssue]
+    ) -> None:
+        """Report public functions without a return type annotation.
+        
+        Args:
+            source_file: Path to the checked file
+            content: Mapped file contents
+            issues: Issue list to append to
+        """
+        tool_name = self.get_tool_name()
+        newline_offsets = array('i', [m.start() for m in _NEWLINE_RE.finditer(content)])
+        
+        for match in _DEF_NO_RETURN_RE.finditer(content):
+            name = match.group('name')
+            if name.startswith(b'_'):  # Skip private methods
+                continue
+            
+            func_name = name.decode('utf-8', 'replace')
+            issues.append(TestIssue(
+                file=source_file,
+                line=bisect.bisect_right(newline_offsets, match.start()) + 1,
+                column=0,
+                message=f"Function '{func_name}' missing return type annotation",
+                severity=TestSeverity.LOW,
+                rule_id="MISSING_RETURN_TYPE",
+                tool=tool_name,
+                error_code="T200",
+                suggestion="Add return type annotation using -> syntax"
+            ))
+    
     def get_tool_name(self) -> str:
         """Get the tool name for this test.
         